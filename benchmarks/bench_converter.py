@@ -0,0 +1,74 @@
+"""
+Benchmark of converting GoodData AI visualization responses (visualization_converter.convert_all).
+
+Generates synthetic createdVisualizations responses with the given number of objects of all
+supported visualization types, a share of them repeated, and reports conversion time, objects
+per second and how many objects remain after identical ones were deduplicated. Every response
+is converted twice to check that the IDs are stable.
+
+Usage:
+    python benchmarks/bench_converter.py
+    python benchmarks/bench_converter.py --sizes 100 10000 100000 --duplicates 0.3
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from visualization_converter import BUCKET_LAYOUTS, convert_all
+
+
+def generate_response(count: int, duplicates: float, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    types = sorted(BUCKET_LAYOUTS)
+    objects = []
+    for i in range(count):
+        if objects and rng.random() < duplicates:
+            objects.append(dict(rng.choice(objects)))
+            continue
+        metrics = [
+            {"id": f"metric_{rng.randrange(500)}", "title": f"Metric {j}", "type": "metric"}
+            if rng.random() < 0.8 else
+            {"id": f"fact_{rng.randrange(500)}", "title": f"Fact {j}", "type": "fact", "aggFunction": "SUM"}
+            for j in range(rng.randint(1, 4))
+        ]
+        dimensionality = [
+            {"id": f"label_{rng.randrange(500)}", "title": f"Label {j}", "type": "attribute"}
+            for j in range(rng.randint(0, 3))
+        ]
+        objects.append({
+            "id": f"visualization_{i}",
+            "title": f"Visualization {i}",
+            "visualizationType": rng.choice(types),
+            "metrics": metrics,
+            "dimensionality": dimensionality,
+            "filters": [],
+        })
+    return {"objects": objects, "reasoning": "Generated for the benchmark."}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000, 100000], help="Objects per AI response")
+    parser.add_argument("--duplicates", type=float, default=0.2, help="Share of objects repeating an earlier one")
+    args = parser.parse_args()
+
+    print(f"{'objects':>8} {'response KB':>12} {'seconds':>9} {'objects/s':>11} {'unique':>8} {'stable ids':>10}")
+    for size in args.sizes:
+        response = generate_response(size, args.duplicates)
+        start = time.perf_counter()
+        converted = convert_all(response)
+        elapsed = time.perf_counter() - start
+        stable = [v["id"] for v in convert_all(response)] == [v["id"] for v in converted]
+        print(
+            f"{size:>8} {len(json.dumps(response)) / 1024:>12.1f} {elapsed:>9.4f} {size / elapsed:>11.0f} "
+            f"{len(converted):>8} {str(stable):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
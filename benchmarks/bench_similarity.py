@@ -0,0 +1,117 @@
+"""
+Benchmark of near-duplicate title detection (title_similarity.find_similar_titles).
+
+Generates synthetic LDM-like titles (multi-word titles, suffixed copies, typos, snake_case and
+upper-case variants) and reports wall time per size of the default mode (lossless filter for
+short titles, trigram filter for all) and of the exact mode. For sizes up to --naive-max the
+results are also compared with the pairwise SequenceMatcher check they replace.
+
+Before the benchmark, REGRESSION_TITLES (short technical titles the trigram filter alone is known
+to miss) are checked: both modes must find every pair the pairwise check finds, otherwise the
+script lists the missed pairs and exits with status 1. The exact mode must also match the
+pairwise check on every size up to --naive-max.
+
+Usage:
+    python benchmarks/bench_similarity.py
+    python benchmarks/bench_similarity.py --sizes 100 1000 10000 50000 --threshold 0.8
+"""
+import argparse
+import random
+import string
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from title_similarity import find_similar_titles
+
+
+# Short titles of real LDMs with a ratio above 0.8 that share few trigrams
+REGRESSION_TITLES = [
+    "code sku", "order sku", "ts__order", "ts__code", "order_id", "order id", "Order ID",
+    "cust_nm", "cust_no", "sku", "skus", "qty", "qty_1", "dt", "dt2", "Revenue", "revenue usd",
+]
+
+
+def check_regressions(threshold: float) -> bool:
+    """Compare both modes with the pairwise check on REGRESSION_TITLES; True if neither missed anything."""
+    expected = set(naive_similar_titles(REGRESSION_TITLES, threshold))
+    ok = True
+    for exact in (False, True):
+        missed = sorted(expected - set(find_similar_titles(REGRESSION_TITLES, threshold, exact=exact)))
+        names = [(REGRESSION_TITLES[i], REGRESSION_TITLES[j]) for i, j in missed]
+        print(f"regression titles, {'exact' if exact else 'default'} mode: {len(expected) - len(missed)}/{len(expected)} pairs found"
+              + (f", missed {names}" if names else ""))
+        ok = ok and not missed
+    return ok
+
+
+def generate_titles(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    vocabulary = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+        for _ in range(3000)
+    ]
+    titles = []
+    for _ in range(count):
+        roll = rng.random()
+        if titles and roll < 0.05:
+            titles.append(f"{rng.choice(titles)} {rng.randint(1, 9)}")
+        elif titles and roll < 0.08:
+            title = rng.choice(titles)
+            i = rng.randrange(len(title))
+            titles.append(title[:i] + rng.choice(string.ascii_lowercase) + title[i + 1:])
+        elif titles and roll < 0.10:
+            titles.append(rng.choice(titles).replace(" ", "_").lower())
+        elif titles and roll < 0.11:
+            titles.append(rng.choice(titles).upper())
+        else:
+            titles.append(" ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 4))).title())
+    return titles
+
+
+def naive_similar_titles(titles: list[str], threshold: float) -> list[tuple[int, int]]:
+    texts = [title.lower() for title in titles]
+    return [
+        (i, j)
+        for i in range(len(texts))
+        for j in range(i + 1, len(texts))
+        if texts[i] and texts[j] and SequenceMatcher(None, texts[i], texts[j]).ratio() > threshold
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000, 10000, 20000, 50000])
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--naive-max", type=int, default=1000, help="Largest size also measured with the pairwise check")
+    args = parser.parse_args()
+
+    exact_ok = check_regressions(args.threshold)
+    print(f"{'titles':>8} {'pairs':>8} {'default [s]':>12} {'recall':>7} {'exact [s]':>10} {'recall':>7} {'pairwise [s]':>13}")
+    for size in args.sizes:
+        titles = generate_titles(size)
+        start = time.perf_counter()
+        pairs = find_similar_titles(titles, args.threshold)
+        engine_time = time.perf_counter() - start
+        start = time.perf_counter()
+        exact_pairs = find_similar_titles(titles, args.threshold, exact=True)
+        exact_time = time.perf_counter() - start
+        naive_time, recall, exact_recall = "-", "-", "-"
+        if size <= args.naive_max:
+            start = time.perf_counter()
+            expected = set(naive_similar_titles(titles, args.threshold))
+            naive_time = f"{time.perf_counter() - start:.2f}"
+            recall = f"{len(expected & set(pairs)) / len(expected):.3f}" if expected else "1.000"
+            exact_recall = f"{len(expected & set(exact_pairs)) / len(expected):.3f}" if expected else "1.000"
+            exact_ok = exact_ok and set(exact_pairs) == expected
+        print(f"{size:>8} {len(exact_pairs):>8} {engine_time:>12.2f} {recall:>7} {exact_time:>10.2f} {exact_recall:>7} {naive_time:>13}", flush=True)
+    if not exact_ok:
+        print("a mode missed pairs the pairwise check finds")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
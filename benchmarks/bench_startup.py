@@ -0,0 +1,91 @@
+"""
+Benchmark of the start-up cost of the MCP server: the time to import server.py in a fresh
+interpreter, as paid by every stdio MCP process a client spawns.
+
+Each run imports the server in a new process and reports the import time and whether the
+GoodData SDK was imported eagerly. With --importtime the slowest modules of the last run
+are listed (python -X importtime).
+
+Requires the packages of the server (gooddata-sdk, mcp, ...) to be installed.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --importtime 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import server
+elapsed = time.perf_counter() - start
+print(json.dumps({
+    "seconds": elapsed,
+    "gooddata_sdk_loaded": "gooddata_sdk" in sys.modules,
+    "modules": len(sys.modules),
+}))
+"""
+
+
+def run_once(importtime: bool) -> tuple[dict, str]:
+    env = {
+        **os.environ,
+        # The server reads its configuration at import time; the values only need to look valid
+        "GOODDATA_HOST": os.environ.get("GOODDATA_HOST", "http://localhost:3000"),
+        "GOODDATA_TOKEN": os.environ.get("GOODDATA_TOKEN", "benchmark"),
+        "GOODDATA_WORKSPACE": os.environ.get("GOODDATA_WORKSPACE", "benchmark"),
+        "GOODDATA_WARMUP": "0",
+    }
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", PROBE]
+    completed = subprocess.run(command, cwd=REPO_ROOT, env=env, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1]), completed.stderr
+
+
+def slowest_imports(importtime_output: str, count: int) -> list[tuple[int, str]]:
+    """(cumulative microseconds, module) of the slowest top-level imports in -X importtime output."""
+    imports = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        if not module.startswith("   "):
+            # A top-level import finished; its direct imports (listed before it) are the ones we want for server
+            if module.strip() == "server":
+                break
+            imports = []
+        elif not module.startswith("     "):
+            # Direct imports only, nested ones are part of their cumulative time
+            imports.append((int(cumulative), module.strip()))
+    return sorted(imports, reverse=True)[:count]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters importing the server")
+    parser.add_argument("--importtime", type=int, default=0, metavar="N", help="List the N slowest imports of the last run")
+    args = parser.parse_args()
+
+    results = []
+    importtime_output = ""
+    for i in range(args.runs):
+        result, importtime_output = run_once(importtime=args.importtime > 0 and i == args.runs - 1)
+        results.append(result)
+    seconds = [result["seconds"] for result in results]
+    print(f"import server: median {statistics.median(seconds):.3f}s, min {min(seconds):.3f}s, max {max(seconds):.3f}s over {args.runs} runs")
+    print(f"modules loaded: {results[-1]['modules']}, gooddata_sdk imported at start-up: {results[-1]['gooddata_sdk_loaded']}")
+    if args.importtime:
+        print("slowest imports (cumulative ms):")
+        for microseconds, module in slowest_imports(importtime_output, args.importtime):
+            print(f"{microseconds / 1000:>10.1f}  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Offline benchmark of the MCP tools in server.py and the checks in ldm_quality_check.py.
+
+The SDK client of the server's default profile is replaced by benchmarks/fake_gooddata.FakeGoodDataSdk serving a
+synthetic workspace, so no GoodData host is needed. The fake is wrapped in the metrics recording
+InstrumentedClient like the real client, so GOODDATA_METRICS_PAYLOAD_SIZES=1 shows its cost. For every workspace size each tool is run
+cold (all caches and the audit store empty) and warm (repeated call), and the script reports
+wall time, SDK calls, bytes the SDK calls would have transferred and peak Python memory
+(tracemalloc).
+
+Requires the packages of the server (gooddata-sdk, mcp, ...) to be installed.
+
+Usage:
+    python benchmarks/bench_tools.py
+    python benchmarks/bench_tools.py --sizes 10 1000 50000 --tools analyze_ldm search --json results.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+# The server reads its configuration at import time; the values only need to look valid
+os.environ.setdefault("GOODDATA_HOST", "http://localhost:3000")
+os.environ.setdefault("GOODDATA_TOKEN", "benchmark")
+os.environ.setdefault("GOODDATA_WORKSPACE", "benchmark")
+os.environ.setdefault("GOODDATA_DATA_SOURCE", "bench-ds")
+
+import server
+import ldm_quality_check
+from fake_gooddata import FakeGoodDataSdk, SyntheticWorkspace
+from instrumentation import InstrumentedClient
+from ldm_audit import AuditStore
+
+
+def _tool(name: str):
+    # Tools are wrapped to run in the worker pool; the benchmark calls the blocking implementation directly
+    tool = getattr(server, name)
+    return getattr(tool, "__wrapped__", tool)
+
+
+def scenarios(workspace: SyntheticWorkspace) -> dict:
+    """Tool name -> zero-argument callable running the tool against the given workspace."""
+    dataset_id, attribute_id = workspace.attribute_ids[0]
+    metric_id = workspace.metrics[-1]["id"]
+    search_term = workspace.metrics[0]["title"].split()[0]
+    dashboard_id = next(iter(workspace.dashboards))
+    datasets = lambda: server.get_ldm(server.client_pool.resolve()).ldm.datasets
+    return {
+        "analyze_ldm": lambda: _tool("analyze_ldm")(),
+        "analyze_field": lambda: _tool("analyze_field")(dataset_id, attribute_id),
+        "profile_dataset": lambda: _tool("profile_dataset")(dataset_id),
+        "patch_ldm": lambda: _tool("patch_ldm")(attribute_id, description="Changed by the benchmark."),
+        "explain_metric": lambda: _tool("explain_metric")(metric_id),
+        "search": lambda: _tool("search")(search_term, [], "auto"),
+        "search_ai": lambda: _tool("search")(search_term, [], "ai"),
+        "create_visualization": lambda: _tool("create_visualization")("Revenue by region"),
+        "add_visualization_to_dashboard": lambda: _tool("add_visualization_to_dashboard")("visualization_0", dashboard_id),
+        "audit_workspaces": lambda: _tool("audit_workspaces")(),
+        "check_obfuscated_titles": lambda: [ldm_quality_check.obfuscated_title_check(attr) for ds in datasets() for attr in ds.attributes],
+        "check_semantic_similarity": lambda: ldm_quality_check.semantic_similarity_check([attr for ds in datasets() for attr in ds.attributes]),
+    }
+
+
+def reset() -> None:
+    """Drop every cache of the server so that the next call starts cold."""
+    server.metadata_cache.invalidate()
+    server.search_cache.invalidate()
+    server.profile_cache.invalidate()
+    server.audit_store = AuditStore()
+
+
+def measure(fake: FakeGoodDataSdk, run) -> dict:
+    calls_before = sum(fake.calls.values())
+    bytes_before = sum(fake.payload_bytes.values())
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = run()
+        if isinstance(result, str) and result.startswith("error:"):
+            # Tools answering in YAML report errors as an "error" key
+            error = result[len("error:"):].strip()
+        else:
+            error = result.get("error") if isinstance(result, dict) else None
+    except Exception as e:
+        error = str(e)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "seconds": round(elapsed, 4),
+        "sdk_calls": sum(fake.calls.values()) - calls_before,
+        "payload_bytes": sum(fake.payload_bytes.values()) - bytes_before,
+        "peak_memory_bytes": peak,
+        "error": error,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000], help="Number of attributes of the synthetic workspace")
+    parser.add_argument("--tools", nargs="+", default=None, help="Only run these scenarios")
+    parser.add_argument("--json", type=Path, default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'size':>7} {'scenario':<32} {'run':<5} {'seconds':>9} {'sdk calls':>9} {'payload KB':>11} {'peak MB':>8}")
+    for size in args.sizes:
+        workspace = SyntheticWorkspace(size)
+        fake = FakeGoodDataSdk(workspace)
+        # Wrapped like the real client, so the cost of the instrumentation is part of the numbers
+        server.client_pool.put("default", InstrumentedClient(fake, server.metrics))
+        for name, run in scenarios(workspace).items():
+            if args.tools and name not in args.tools:
+                continue
+            reset()
+            for phase in ("cold", "warm"):
+                measurement = {"size": size, "scenario": name, "run": phase, **measure(fake, run)}
+                results.append(measurement)
+                print(
+                    f"{size:>7} {name:<32} {phase:<5} {measurement['seconds']:>9.4f} {measurement['sdk_calls']:>9} "
+                    f"{measurement['payload_bytes'] / 1024:>11.1f} {measurement['peak_memory_bytes'] / 2 ** 20:>8.1f}"
+                    + (f"  error: {measurement['error'].splitlines()[0]}" if measurement["error"] else "")
+                )
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Local stand-in for the GoodDataSdk client used by server.py, serving a synthetic workspace.
+
+The fake implements only the SDK calls the server makes. It returns real SDK declarative
+objects (built from API-shaped dicts), so the server code under test runs unchanged, and it
+records how many times each call was made and how many bytes each response would have had.
+"""
+import copy
+import json
+import random
+import re
+import string
+from collections import Counter
+from types import SimpleNamespace
+
+from gooddata_api_client.exceptions import ApiException, NotFoundException
+from gooddata_sdk import CatalogDeclarativeAnalytics, CatalogDeclarativeModel
+
+DATA_SOURCE_ID = "bench-ds"
+
+
+class SyntheticWorkspace:
+    """
+    Declarative LDM, analytics model, dependency graph and AI responses of a generated workspace.
+
+    Args:
+        size: Number of attributes; the number of datasets, facts, metrics, visualizations
+            and dashboards is derived from it
+        seed: Seed of the generator, the same seed gives the same workspace
+    """
+
+    def __init__(self, size: int, seed: int = 7):
+        self.size = size
+        rng = random.Random(seed)
+        vocabulary = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9))) for _ in range(2000)]
+
+        def title() -> str:
+            return " ".join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3))).title()
+
+        def description(text: str) -> str | None:
+            # Roughly a third of the objects miss a description, like in real workspaces
+            return None if rng.random() < 0.33 else f"Describes {text.lower()}."
+
+        datasets = []
+        self.attribute_ids = []
+        self.fact_ids = []
+        dataset_count = max(1, size // 20)
+        for d in range(dataset_count):
+            attributes, facts = [], []
+            for a in range(d, size, dataset_count):
+                attribute_title = title()
+                attribute_id = f"attr_{a}"
+                self.attribute_ids.append((f"dataset_{d}", attribute_id))
+                attributes.append({
+                    "id": attribute_id,
+                    "title": attribute_title,
+                    "description": description(attribute_title),
+                    "sourceColumn": f"col_{a}",
+                    "sourceColumnDataType": "STRING",
+                    "labels": [{
+                        "id": f"label_{a}",
+                        "title": attribute_title,
+                        "sourceColumn": f"col_{a}",
+                        "sourceColumnDataType": "STRING",
+                        "valueType": "TEXT",
+                        "tags": [],
+                    }],
+                    "tags": [],
+                })
+            for f in range(d, max(1, size // 4), dataset_count):
+                fact_title = title()
+                fact_id = f"fact_{f}"
+                self.fact_ids.append(fact_id)
+                facts.append({
+                    "id": fact_id,
+                    "title": fact_title,
+                    "description": description(fact_title),
+                    "sourceColumn": f"num_{f}",
+                    "sourceColumnDataType": "NUMERIC",
+                    "tags": [],
+                })
+            datasets.append({
+                "id": f"dataset_{d}",
+                "title": title(),
+                "description": None,
+                "grain": [],
+                "references": [],
+                "attributes": attributes,
+                "facts": facts,
+                "dataSourceTableId": {"dataSourceId": DATA_SOURCE_ID, "id": f"table_{d}", "type": "dataSource", "path": ["public", f"table_{d}"]},
+                "tags": [],
+            })
+        self.ldm = _drop_none({"ldm": {"datasets": datasets, "dateInstances": []}})
+
+        metrics = []
+        nodes = []
+        edges = []
+        for m in range(max(1, size // 5)):
+            metric_id = f"metric_{m}"
+            if m and rng.random() < 0.3:
+                # Nested metric, so that explain_metric has something to unfold
+                used = (f"metric_{rng.randrange(m)}", "metric")
+            else:
+                used = (rng.choice(self.fact_ids), "fact")
+            metrics.append({
+                "id": metric_id,
+                "title": title(),
+                "description": None,
+                "content": {"format": "#,##0", "maql": f"SELECT SUM({{{used[1]}/{used[0]}}})"},
+                "tags": [],
+            })
+            edges.append((used, (metric_id, "metric")))
+        visualizations = []
+        for v in range(max(1, size // 10)):
+            metric = rng.choice(metrics)
+            dataset_id, attribute_id = rng.choice(self.attribute_ids)
+            visualization_id = f"visualization_{v}"
+            visualizations.append({
+                "id": visualization_id,
+                "title": title(),
+                "description": None,
+                "content": {
+                    "visualizationUrl": "local:bar",
+                    "buckets": [
+                        {"localIdentifier": "measures", "items": [{"measure": {"localIdentifier": "m1", "definition": {"measureDefinition": {"item": {"identifier": {"id": metric["id"], "type": "metric"}}, "filters": []}}}}]},
+                        {"localIdentifier": "view", "items": [{"attribute": {"localIdentifier": "a1", "displayForm": {"identifier": {"id": attribute_id.replace("attr", "label"), "type": "label"}}}}]},
+                    ],
+                    "filters": [],
+                    "properties": {},
+                    "version": "2",
+                },
+                "tags": [],
+            })
+            edges.append(((metric["id"], "metric"), (visualization_id, "visualizationObject")))
+        dashboards = []
+        for b in range(max(1, size // 100)):
+            dashboard_id = f"dashboard_{b}"
+            items = []
+            for visualization in rng.sample(visualizations, min(len(visualizations), 6)):
+                items.append({
+                    "type": "IDashboardLayoutItem",
+                    "size": {"xl": {"gridWidth": 6}},
+                    "widget": {
+                        "type": "insight",
+                        "insight": {"identifier": {"id": visualization["id"], "type": "visualizationObject"}},
+                        "title": visualization["title"],
+                        "localIdentifier": f"{dashboard_id}_{visualization['id']}",
+                        "configuration": {"description": {"includeMetrics": False, "source": "widget", "visible": True}, "hideTitle": False},
+                        "properties": {},
+                    },
+                })
+                edges.append(((visualization["id"], "visualizationObject"), (dashboard_id, "analyticalDashboard")))
+            dashboards.append({
+                "id": dashboard_id,
+                "title": title(),
+                "description": None,
+                "content": {"layout": {"type": "IDashboardLayout", "sections": [{"type": "IDashboardLayoutSection", "items": items}]}, "version": "2"},
+                "tags": [],
+            })
+        self.analytics = _drop_none({"analytics": {
+            "metrics": metrics,
+            "visualizationObjects": visualizations,
+            "analyticalDashboards": dashboards,
+            "dashboardPlugins": [],
+            "filterContexts": [],
+        }})
+
+        titles = {}
+        for ds in datasets:
+            titles.update({(a["id"], "attribute"): a["title"] for a in ds["attributes"]})
+            titles.update({(f["id"], "fact"): f["title"] for f in ds["facts"]})
+        titles.update({(m["id"], "metric"): m["title"] for m in metrics})
+        titles.update({(v["id"], "visualizationObject"): v["title"] for v in visualizations})
+        titles.update({(b["id"], "analyticalDashboard"): b["title"] for b in dashboards})
+        nodes = [{"id": key[0], "type": key[1], "title": value} for key, value in titles.items()]
+        self.dependency_graph = {"graph": {
+            "nodes": nodes,
+            "edges": [[{"id": a[0], "type": a[1]}, {"id": b[0], "type": b[1]}] for a, b in edges],
+        }}
+        self.metrics = metrics
+        self.dashboards = {b["id"]: b for b in dashboards}
+        self.rng = rng
+
+    def chat_chunks(self, filler_chunks: int = 20, trailing_chunks: int = 20) -> list[dict]:
+        """AI chat stream: reasoning chunks, the created visualization, then the rest of the answer."""
+        metric = self.rng.choice(self.metrics)
+        _, attribute_id = self.rng.choice(self.attribute_ids)
+        created = {"createdVisualizations": {"objects": [{
+            "id": f"ai_{metric['id']}",
+            "title": f"{metric['title']} by {attribute_id}",
+            "visualizationType": "COLUMN",
+            "metrics": [{"id": metric["id"], "title": metric["title"], "type": "metric"}],
+            "dimensionality": [{"id": attribute_id.replace("attr", "label"), "title": attribute_id, "type": "attribute"}],
+            "filters": [],
+        }], "reasoning": "Generated for the benchmark."}}
+        filler = [{"textResponse": "Thinking " * 20} for _ in range(filler_chunks)]
+        trailing = [{"textResponse": "Explaining " * 20} for _ in range(trailing_chunks)]
+        return filler + [created] + trailing
+
+
+def _drop_none(data):
+    """Remove keys without a value, the API omits them and the SDK models reject None."""
+    if isinstance(data, dict):
+        return {key: _drop_none(value) for key, value in data.items() if value is not None}
+    if isinstance(data, list):
+        return [_drop_none(value) for value in data]
+    return data
+
+
+def _namespace(data):
+    """Turn nested dicts into attribute-accessible objects (for responses the server reads as attributes)."""
+    if isinstance(data, dict):
+        return SimpleNamespace(**{key: _namespace(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return [_namespace(value) for value in data]
+    return data
+
+
+class FakeGoodDataSdk:
+    """
+    Drop-in replacement for the GoodData SDK client of server.py backed by a SyntheticWorkspace.
+    Every one of the `workspaces` listed by the host serves the same synthetic workspace.
+
+    Attributes:
+        calls: SDK method name -> number of calls
+        payload_bytes: SDK method name -> bytes of JSON the real API would have transferred
+    """
+
+    def __init__(self, workspace: SyntheticWorkspace, workspaces: int = 8):
+        self.workspace = workspace
+        self.workspace_ids = [f"workspace_{i}" for i in range(workspaces)]
+        self.visualization_ids = set()
+        self.calls = Counter()
+        self.payload_bytes = Counter()
+        self.catalog_workspace = SimpleNamespace(list_workspaces=self._list_workspaces)
+        self.catalog_workspace_content = SimpleNamespace(
+            get_declarative_ldm=self._get_declarative_ldm,
+            put_declarative_ldm=self._put_declarative_ldm,
+            get_declarative_analytics_model=self._get_declarative_analytics_model,
+            get_dependent_entities_graph=self._get_dependent_entities_graph,
+        )
+        self.compute = SimpleNamespace(search_ai=self._search_ai, ai_chat_stream=self._ai_chat_stream)
+        self.client = SimpleNamespace(
+            actions_api=SimpleNamespace(scan_sql=self._scan_sql),
+            entities_api=SimpleNamespace(
+                create_entity_visualization_objects=self._create_visualization,
+                get_entity_analytical_dashboards=self._get_dashboard,
+                patch_entity_analytical_dashboards=self._patch_dashboard,
+            ),
+        )
+
+    def _record(self, name: str, payload) -> None:
+        self.calls[name] += 1
+        self.payload_bytes[name] += len(json.dumps(payload, default=str))
+
+    def _list_workspaces(self):
+        self._record("list_workspaces", self.workspace_ids)
+        return [SimpleNamespace(id=workspace_id) for workspace_id in self.workspace_ids]
+
+    def _get_declarative_ldm(self, workspace_id: str):
+        self._record("get_declarative_ldm", self.workspace.ldm)
+        return CatalogDeclarativeModel.from_dict(self.workspace.ldm)
+
+    def _put_declarative_ldm(self, workspace_id: str, ldm) -> None:
+        self.workspace.ldm = ldm.to_dict()
+        self._record("put_declarative_ldm", self.workspace.ldm)
+
+    def _get_declarative_analytics_model(self, workspace_id: str):
+        self._record("get_declarative_analytics_model", self.workspace.analytics)
+        return CatalogDeclarativeAnalytics.from_dict(self.workspace.analytics)
+
+    def _get_dependent_entities_graph(self, workspace_id: str):
+        self._record("get_dependent_entities_graph", self.workspace.dependency_graph)
+        graph = self.workspace.dependency_graph["graph"]
+        return SimpleNamespace(graph=SimpleNamespace(
+            nodes=_namespace(graph["nodes"]),
+            edges=[tuple(_namespace(edge)) for edge in graph["edges"]],
+        ))
+
+    def _search_ai(self, workspace_id: str, question: str, object_types=None):
+        words = set(question.lower().split())
+        results = [
+            {"id": node["id"], "title": node["title"], "type": node["type"], "score": 0.5}
+            for node in self.workspace.dependency_graph["graph"]["nodes"]
+            if words & set(node["title"].lower().split()) and (not object_types or node["type"] in object_types)
+        ][:20]
+        self._record("search_ai", results)
+        return SimpleNamespace(results=results)
+
+    def _ai_chat_stream(self, workspace_id: str, question: str):
+        self.calls["ai_chat_stream"] += 1
+        for chunk in self.workspace.chat_chunks():
+            self.payload_bytes["ai_chat_stream"] += len(json.dumps(chunk))
+            yield chunk
+
+    def _scan_sql(self, data_source_id: str, request):
+        sql = request.sql
+        columns = len(re.findall(r"COUNT\(DISTINCT ", sql))
+        if columns:
+            rows = [["10000"] + ["5000", "100", "a", "z"] * columns]
+        else:
+            selected = re.search(r"SELECT (.*?) FROM", sql.split("(", 1)[1]).group(1)
+            rows = [[f"value_{i}"] * (selected.count(",") + 1) for i in range(100)]
+        response = {"data_preview": rows}
+        self._record("scan_sql", response)
+        return response
+
+    def _create_visualization(self, workspace_id: str, document, **kwargs) -> None:
+        self._record("create_entity_visualization_objects", {"id": document.data.id})
+        if document.data.id in self.visualization_ids:
+            raise ApiException(status=409, reason="Conflict")
+        self.visualization_ids.add(document.data.id)
+
+    def _get_dashboard(self, workspace_id: str, dashboard_id: str, **kwargs):
+        dashboard = self.workspace.dashboards.get(dashboard_id)
+        if dashboard is None:
+            raise NotFoundException(status=404, reason="Not Found")
+        self._record("get_entity_analytical_dashboards", dashboard)
+        content = copy.deepcopy(dashboard["content"])
+        return SimpleNamespace(data=SimpleNamespace(attributes=SimpleNamespace(content=content)))
+
+    def _patch_dashboard(self, workspace_id: str, dashboard_id: str, document, **kwargs) -> None:
+        content = document.data.attributes.content
+        self.workspace.dashboards[dashboard_id]["content"] = content
+        self._record("patch_entity_analytical_dashboards", content)
@@ -0,0 +1,153 @@
+import bisect
+import re
+from dataclasses import dataclass, field
+
+_TOKEN = re.compile(r"[^\W_]+")
+
+# Scores of the different kinds of matches, comparable with search_ai match scores
+EXACT_ID_SCORE = 1.0
+EXACT_TITLE_SCORE = 0.95
+TOKEN_SCORE = 0.8
+PREFIX_SCORE = 0.6
+
+
+def tokenize(text: str | None) -> list[str]:
+    """Split a title or id into lowercase words; "order_date", "Order Date" and "order-date" give the same tokens."""
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+@dataclass
+class CatalogEntry:
+    id: str
+    type: str
+    title: str | None
+    description: str | None = None
+    visualization_type: str | None = None
+
+    def to_result(self, score: float) -> dict:
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "type": self.type,
+            "visualization_type": self.visualization_type,
+            "match_score": score,
+        }
+
+
+@dataclass
+class CatalogSearchIndex:
+    """
+    In-memory inverted index over the catalog objects of a workspace, built from the declarative
+    LDM and analytics model. Answers exact id/title and word/prefix queries without calling search_ai.
+
+    Attributes:
+        entries: All indexed objects
+        by_id: Lowercase object id -> entry positions
+        by_title: Lowercase title -> entry positions
+        by_token: Word of a title or id -> entry positions
+        vocabulary: Sorted words of by_token, used for prefix lookups
+    """
+    entries: list[CatalogEntry] = field(default_factory=list)
+    by_id: dict[str, list[int]] = field(default_factory=dict)
+    by_title: dict[str, list[int]] = field(default_factory=dict)
+    by_token: dict[str, set[int]] = field(default_factory=dict)
+    vocabulary: list[str] = field(default_factory=list)
+
+    @classmethod
+    def build(cls, declarative_ldm, declarative_analytics) -> "CatalogSearchIndex":
+        """
+        Build the index from a declarative LDM and analytics model.
+
+        Args:
+            declarative_ldm: CatalogDeclarativeModel
+            declarative_analytics: CatalogDeclarativeAnalytics
+
+        Returns:
+            CatalogSearchIndex: Index over datasets, attributes, labels, facts, dates, metrics, visualizations and dashboards
+        """
+        index = cls()
+        ldm = declarative_ldm.ldm
+        for ds in getattr(ldm, "datasets", None) or []:
+            index._add(CatalogEntry(ds.id, "dataset", ds.title, ds.description))
+            for attr in ds.attributes or []:
+                index._add(CatalogEntry(attr.id, "attribute", attr.title, attr.description))
+                for label in attr.labels or []:
+                    index._add(CatalogEntry(label.id, "label", label.title, label.description))
+            for fact in ds.facts or []:
+                index._add(CatalogEntry(fact.id, "fact", fact.title, fact.description))
+        for date in getattr(ldm, "date_instances", None) or []:
+            index._add(CatalogEntry(date.id, "date", date.title, date.description))
+        analytics = declarative_analytics.analytics
+        for metric in getattr(analytics, "metrics", None) or []:
+            index._add(CatalogEntry(metric.id, "metric", metric.title, metric.description))
+        for visualization in getattr(analytics, "visualization_objects", None) or []:
+            url = (visualization.content or {}).get("visualizationUrl", "")
+            index._add(CatalogEntry(
+                visualization.id, "visualization", visualization.title, visualization.description,
+                visualization_type=url.split(":")[-1] or None,
+            ))
+        for dashboard in getattr(analytics, "analytical_dashboards", None) or []:
+            index._add(CatalogEntry(dashboard.id, "dashboard", dashboard.title, dashboard.description))
+        index.vocabulary = sorted(index.by_token)
+        return index
+
+    def _add(self, entry: CatalogEntry) -> None:
+        position = len(self.entries)
+        self.entries.append(entry)
+        self.by_id.setdefault(entry.id.lower(), []).append(position)
+        if entry.title:
+            self.by_title.setdefault(entry.title.lower(), []).append(position)
+        for token in tokenize(entry.title) + tokenize(entry.id):
+            self.by_token.setdefault(token, set()).add(position)
+
+    def _prefix_matches(self, prefix: str) -> set[int]:
+        matches = set()
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            matches |= self.by_token[token]
+        return matches
+
+    def search(self, term: str, types: list[str] | None = None, limit: int = 20) -> list[dict]:
+        """
+        Find objects by id, title, words or word prefixes.
+
+        An exact id or title match scores highest; otherwise the score is the share of query
+        words found in the object's title or id, with prefix matches counting less than whole words.
+
+        Args:
+            term: Searched text
+            types: Only return objects of these types (e.g. ["metric", "attribute"])
+            limit: Maximum number of results
+
+        Returns:
+            list[dict]: Results in the shape returned by the search tool, best first
+        """
+        needle = term.strip().lower()
+        scores: dict[int, float] = {}
+        for position in self.by_id.get(needle, []):
+            scores[position] = EXACT_ID_SCORE
+        for position in self.by_title.get(needle, []):
+            scores.setdefault(position, EXACT_TITLE_SCORE)
+        tokens = tokenize(needle)
+        if tokens:
+            partial: dict[int, float] = {}
+            for token in tokens:
+                exact = self.by_token.get(token, set())
+                for position in exact:
+                    partial[position] = partial.get(position, 0.0) + TOKEN_SCORE
+                for position in self._prefix_matches(token) - exact:
+                    partial[position] = partial.get(position, 0.0) + PREFIX_SCORE
+            for position, score in partial.items():
+                scores.setdefault(position, round(score / len(tokens), 3))
+        allowed = set(types) if types else None
+        ranked = sorted(
+            (
+                (score, position) for position, score in scores.items()
+                if allowed is None or self.entries[position].type in allowed
+            ),
+            key=lambda item: (-item[0], item[1]),
+        )
+        return [self.entries[position].to_result(score) for score, position in ranked[:limit]]
@@ -0,0 +1,164 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+from metadata_cache import MetadataCache
+
+SAMPLE_METHODS = ("limit", "tablesample")
+
+
+@dataclass
+class ColumnProfile:
+    column: str
+    sampled_rows: int
+    distinct_count: int
+    null_ratio: float
+    min: str | None
+    max: str | None
+    sample_values: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {
+            "column": self.column,
+            "sampled_rows": self.sampled_rows,
+            # Counted on the sample, a lower bound of the distinct values in the whole table
+            "distinct_estimate": self.distinct_count,
+            "null_ratio": self.null_ratio,
+            "min": self.min,
+            "max": self.max,
+            "sample_values": self.sample_values,
+        }
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sample_source(table: str, columns: list[str], method: str, sample_rows: int, sample_percent: float) -> str:
+    """Bounded subquery over the table, so no query scans or sorts the whole table."""
+    selected = ", ".join(quote_identifier(column) for column in columns)
+    if method == "tablesample":
+        return f"(SELECT {selected} FROM {quote_identifier(table)} TABLESAMPLE SYSTEM ({sample_percent:g}) LIMIT {sample_rows}) sample"
+    return f"(SELECT {selected} FROM {quote_identifier(table)} LIMIT {sample_rows}) sample"
+
+
+def build_stats_sql(table: str, columns: list[str], method: str = "limit", sample_rows: int = 10000, sample_percent: float = 1.0) -> str:
+    """
+    Build one query returning row count, distinct count, null count, min and max of every column.
+
+    Args:
+        table: Source table
+        columns: Source columns of the table
+        method: "limit" reads the first sample_rows rows, "tablesample" samples sample_percent % of the
+            table's blocks (TABLESAMPLE SYSTEM, supported e.g. by PostgreSQL and Snowflake) and caps them at sample_rows
+        sample_rows: Maximal number of sampled rows
+        sample_percent: Percentage of the table sampled by the "tablesample" method
+
+    Returns:
+        str: SQL query returning a single row
+    """
+    expressions = ["COUNT(*)"]
+    for column in columns:
+        quoted = quote_identifier(column)
+        expressions += [
+            f"COUNT(DISTINCT {quoted})",
+            f"SUM(CASE WHEN {quoted} IS NULL THEN 1 ELSE 0 END)",
+            f"MIN({quoted})",
+            f"MAX({quoted})",
+        ]
+    return f"SELECT {', '.join(expressions)} FROM {_sample_source(table, columns, method, sample_rows, sample_percent)};"
+
+
+def build_values_sql(table: str, columns: list[str], values_rows: int = 1000) -> str:
+    """Build one bounded query returning rows from which example values of all columns are picked."""
+    return f"SELECT * FROM {_sample_source(table, columns, 'limit', values_rows, 0)};"
+
+
+def _to_int(value) -> int:
+    return int(float(value)) if value not in (None, "") else 0
+
+
+def _to_text(value) -> str | None:
+    return None if value is None else str(value)
+
+
+def parse_profiles(columns: list[str], stats_row: list, value_rows: list[list], max_values: int = 10) -> dict[str, ColumnProfile]:
+    """
+    Turn the results of the stats and values queries into profiles.
+
+    Args:
+        columns: Columns in the order used to build the queries
+        stats_row: The single row returned by the stats query
+        value_rows: Rows returned by the values query
+        max_values: Maximal number of distinct example values per column
+
+    Returns:
+        dict[str, ColumnProfile]: Profile per column
+    """
+    sampled_rows = _to_int(stats_row[0])
+    profiles = {}
+    for i, column in enumerate(columns):
+        distinct, nulls, minimum, maximum = stats_row[1 + 4 * i:5 + 4 * i]
+        examples = []
+        for row in value_rows:
+            value = row[i]
+            if value is not None and str(value) not in examples:
+                examples.append(str(value))
+                if len(examples) == max_values:
+                    break
+        profiles[column] = ColumnProfile(
+            column=column,
+            sampled_rows=sampled_rows,
+            distinct_count=_to_int(distinct),
+            null_ratio=round(_to_int(nulls) / sampled_rows, 4) if sampled_rows else 0.0,
+            min=_to_text(minimum),
+            max=_to_text(maximum),
+            sample_values=examples,
+        )
+    return profiles
+
+
+@dataclass
+class ColumnProfiler:
+    """
+    Profiles columns of source tables with bounded queries and caches the profiles per table/column.
+
+    All requested columns of one table that are not cached yet are profiled together, with one
+    stats query and one example values query, regardless of the number of columns.
+
+    Args:
+        run_sql: Executes SQL in the data source and returns the rows
+        cache: Cache of profiles; its TTL controls how long a profile is reused
+        method: Sampling method, one of SAMPLE_METHODS
+        sample_rows: Maximal number of rows the stats query reads
+        sample_percent: Percentage of the table sampled by the "tablesample" method
+    """
+    run_sql: Callable[[str], list[list]]
+    cache: MetadataCache
+    method: str = "limit"
+    sample_rows: int = 10000
+    sample_percent: float = 1.0
+
+    def profile(self, scope: str, table: str, columns: list[str]) -> dict[str, ColumnProfile]:
+        """
+        Return profiles of the given columns of one table.
+
+        Args:
+            scope: Workspace (or data source) the table belongs to, part of the cache key
+            table: Source table
+            columns: Source columns
+
+        Returns:
+            dict[str, ColumnProfile]: Profile per column
+        """
+        if self.method not in SAMPLE_METHODS:
+            raise ValueError(f"Unsupported sampling method {self.method}, expected one of {', '.join(SAMPLE_METHODS)}")
+        columns = list(dict.fromkeys(columns))
+        profiles = {column: self.cache.peek(("column_profile", scope, table, column)) for column in columns}
+        missing = [column for column, profile in profiles.items() if profile is None]
+        if missing:
+            stats_rows = self.run_sql(build_stats_sql(table, missing, self.method, self.sample_rows, self.sample_percent))
+            value_rows = self.run_sql(build_values_sql(table, missing))
+            for column, profile in parse_profiles(missing, stats_rows[0], value_rows).items():
+                self.cache.put(("column_profile", scope, table, column), profile)
+                profiles[column] = profile
+        return profiles
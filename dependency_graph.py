@@ -0,0 +1,98 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+# Entities are identified by (id, type), e.g. ("revenue", "metric")
+EntityKey = tuple[str, str]
+
+
+@dataclass
+class DependencyGraphIndex:
+    """
+    Adjacency lists over the workspace dependency graph, built once per graph download.
+
+    An edge (a, b) of the GoodData dependency graph means that b depends on a, e.g. a metric
+    depends on the facts and metrics its MAQL refers to and a visualization depends on its metrics.
+
+    Attributes:
+        nodes: Entity key -> graph node (with id, type and title)
+        uses: Entity key -> keys of the entities it depends on
+        used_by: Entity key -> keys of the entities depending on it
+    """
+    nodes: dict[EntityKey, Any] = field(default_factory=dict)
+    uses: dict[EntityKey, list[EntityKey]] = field(default_factory=dict)
+    used_by: dict[EntityKey, list[EntityKey]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, dependency_graph) -> "DependencyGraphIndex":
+        """
+        Build the index from the response of get_dependent_entities_graph.
+
+        Args:
+            dependency_graph: CatalogDependentEntitiesResponse of the whole workspace
+
+        Returns:
+            DependencyGraphIndex: Forward and reverse adjacency lists
+        """
+        index = cls()
+        for node in dependency_graph.graph.nodes:
+            index.nodes[(node.id, node.type)] = node
+        for dependency, dependent in dependency_graph.graph.edges:
+            dependency_key = (dependency.id, dependency.type)
+            dependent_key = (dependent.id, dependent.type)
+            index.uses.setdefault(dependent_key, []).append(dependency_key)
+            index.used_by.setdefault(dependency_key, []).append(dependent_key)
+        return index
+
+    def title(self, key: EntityKey) -> str | None:
+        node = self.nodes.get(key)
+        return getattr(node, "title", None) if node is not None else None
+
+    @staticmethod
+    def _walk(adjacency: dict[EntityKey, list[EntityKey]], key: EntityKey, through_types: set[str] | None) -> list[EntityKey]:
+        # Breadth-first walk; entities of other than `through_types` are reported but not expanded
+        seen = {key}
+        found = []
+        queue = deque([key])
+        while queue:
+            current = queue.popleft()
+            for neighbour in adjacency.get(current, ()):
+                if neighbour in seen:
+                    continue
+                seen.add(neighbour)
+                found.append(neighbour)
+                if through_types is None or neighbour[1] in through_types:
+                    queue.append(neighbour)
+        return found
+
+    def dependencies(self, key: EntityKey, transitive: bool = False, through_types: set[str] | None = None) -> list[EntityKey]:
+        """
+        Return entities the given entity depends on.
+
+        Args:
+            key: Entity key
+            transitive: Follow dependencies of dependencies
+            through_types: When transitive, only expand entities of these types (e.g. {"metric"}
+                unfolds nested metrics without descending into attributes and facts)
+
+        Returns:
+            list[EntityKey]: Dependencies in breadth-first order
+        """
+        if not transitive:
+            return list(self.uses.get(key, ()))
+        return self._walk(self.uses, key, through_types)
+
+    def dependents(self, key: EntityKey, transitive: bool = True) -> list[EntityKey]:
+        """
+        Return entities depending on the given entity ("where used").
+
+        Args:
+            key: Entity key
+            transitive: Include dependents of dependents, e.g. dashboards using a visualization using the metric
+
+        Returns:
+            list[EntityKey]: Dependents in breadth-first order
+        """
+        if not transitive:
+            return list(self.used_by.get(key, ()))
+        return self._walk(self.used_by, key, None)
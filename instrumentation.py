@@ -0,0 +1,357 @@
+import inspect
+import json
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+# Upper bounds of the latency histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+METRIC_PREFIX = "gooddata_mcp"
+
+
+@dataclass
+class Histogram:
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    sum: float = 0.0
+
+    def __post_init__(self):
+        self.counts = [0] * len(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """(upper bound, number of observations <= bound) pairs, as Prometheus expects them."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket containing the q-quantile; None if there are no observations or it is above the last bucket."""
+        if not self.count:
+            return None
+        for bound, total in self.cumulative():
+            if total >= q * self.count:
+                return bound
+        return None
+
+
+@dataclass
+class CallStats:
+    latency: Histogram = field(default_factory=Histogram)
+    errors: int = 0
+    timeouts: int = 0
+    payload_bytes: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.latency.count,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "total_seconds": round(self.latency.sum, 4),
+            "mean_seconds": round(self.latency.sum / self.latency.count, 4) if self.latency.count else None,
+            "p50_seconds_le": self.latency.quantile(0.5),
+            "p95_seconds_le": self.latency.quantile(0.95),
+            "payload_bytes": self.payload_bytes,
+        }
+
+
+@dataclass
+class CallRecord:
+    """Outcome of a tracked call; set `error` or `payload_bytes` before the tracked block ends."""
+    error: bool = False
+    payload_bytes: int = 0
+
+
+class SlowCallProfiler:
+    """
+    Sampling profiler for slow calls.
+
+    A background thread looks at the stacks of the threads running tracked calls every
+    `interval` seconds (sys._current_frames). Calls that take longer than `threshold`
+    seconds keep their most frequent stacks, so one can see where a slow tool spent its time.
+
+    Args:
+        threshold: Calls longer than this many seconds are reported
+        interval: Sampling interval in seconds
+        keep: Number of slow calls kept
+    """
+
+    def __init__(self, threshold: float, interval: float = 0.01, keep: int = 20):
+        self.threshold = threshold
+        self.interval = interval
+        self.slow_calls: deque = deque(maxlen=keep)
+        self._active: dict[int, tuple[str, float, Counter]] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        # Set while calls are tracked, so the sampler sleeps when the server is idle
+        self._busy = threading.Event()
+
+    def _sample(self) -> None:
+        while True:
+            self._busy.wait()
+            time.sleep(self.interval)
+            now = time.monotonic()
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, (_, started, samples) in self._active.items():
+                    frame = frames.get(thread_id)
+                    # Only calls already slower than the threshold are sampled, fast calls cost nothing
+                    if frame is not None and now - started >= self.threshold:
+                        stack = traceback.extract_stack(frame)
+                        samples[";".join(f"{entry.name} ({entry.filename.rsplit('/', 1)[-1]}:{entry.lineno})" for entry in stack)] += 1
+                if not self._active:
+                    self._busy.clear()
+
+    @contextmanager
+    def track(self, name: str):
+        thread_id = threading.get_ident()
+        started = time.monotonic()
+        samples = Counter()
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample, name="gooddata-profiler", daemon=True)
+                self._thread.start()
+            self._active[thread_id] = (name, started, samples)
+            self._busy.set()
+        try:
+            yield
+        finally:
+            with self._lock:
+                del self._active[thread_id]
+            seconds = time.monotonic() - started
+            if seconds >= self.threshold:
+                self.slow_calls.append({
+                    "name": name,
+                    "seconds": round(seconds, 4),
+                    "samples": sum(samples.values()),
+                    "top_stacks": [{"stack": stack, "samples": count} for stack, count in samples.most_common(5)],
+                })
+
+
+def payload_size(value: Any) -> int:
+    """Approximate size of an API response in bytes: the length of its JSON form."""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    to_dict = getattr(value, "to_dict", None)
+    if callable(to_dict):
+        value = to_dict()
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def is_error_result(result: Any) -> bool:
+    """Tools report failures as an "error" key, either in a dict or in a YAML document."""
+    if isinstance(result, dict):
+        return "error" in result
+    return isinstance(result, str) and result.startswith("error:")
+
+
+class Metrics:
+    """
+    Latency histograms, error and timeout counts and payload sizes of tool calls and SDK calls,
+    plus hit rates of registered caches.
+
+    Args:
+        measure_payloads: Compute response sizes of SDK calls; off by default because it serializes every
+            response once more, which can take as long as the call itself for large declarative documents
+        profiler: Optional sampling profiler for slow tool calls
+    """
+
+    def __init__(self, measure_payloads: bool = False, profiler: SlowCallProfiler | None = None):
+        self.measure_payloads = measure_payloads
+        self.profiler = profiler
+        self._calls: dict[tuple[str, str], CallStats] = {}
+        self._caches: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, environ) -> "Metrics":
+        """
+        Configure the metrics from environment variables.
+
+        GOODDATA_METRICS_PAYLOAD_SIZES=1 measures SDK response sizes. GOODDATA_SLOW_CALL_SECONDS
+        enables the sampling profiler for tool calls slower than the given number of seconds,
+        GOODDATA_SLOW_CALL_SAMPLE_INTERVAL sets its sampling interval.
+        """
+        slow_call_seconds = float(environ.get("GOODDATA_SLOW_CALL_SECONDS", "0"))
+        return cls(
+            measure_payloads=environ.get("GOODDATA_METRICS_PAYLOAD_SIZES", "0") == "1",
+            profiler=SlowCallProfiler(
+                slow_call_seconds,
+                interval=float(environ.get("GOODDATA_SLOW_CALL_SAMPLE_INTERVAL", "0.01")),
+            ) if slow_call_seconds > 0 else None,
+        )
+
+    def register_cache(self, name: str, cache) -> None:
+        """Report the statistics of a MetadataCache under the given name."""
+        self._caches[name] = cache
+
+    def _stats(self, kind: str, name: str) -> CallStats:
+        key = (kind, name)
+        if key not in self._calls:
+            self._calls[key] = CallStats()
+        return self._calls[key]
+
+    @contextmanager
+    def track(self, kind: str, name: str, profile: bool = False):
+        """
+        Time the enclosed block as one call; an exception counts as an error and is re-raised.
+
+        Args:
+            kind: "tool" or "sdk"
+            name: Tool name or SDK method path
+            profile: Sample the stack of the block with the slow call profiler, if enabled
+        """
+        record = CallRecord()
+        started = time.perf_counter()
+        try:
+            if profile and self.profiler is not None:
+                with self.profiler.track(name):
+                    yield record
+            else:
+                yield record
+        except Exception:
+            # GeneratorExit of a closed stream is not a failure
+            record.error = True
+            raise
+        finally:
+            seconds = time.perf_counter() - started
+            with self._lock:
+                stats = self._stats(kind, name)
+                stats.latency.observe(seconds)
+                stats.errors += record.error
+                stats.payload_bytes += record.payload_bytes
+
+    def record_timeout(self, kind: str, name: str) -> None:
+        with self._lock:
+            self._stats(kind, name).timeouts += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+        if self.profiler is not None:
+            self.profiler.slow_calls.clear()
+
+    def snapshot(self) -> dict:
+        """All metrics as a JSON-serializable dict."""
+        with self._lock:
+            calls = {key: stats.to_dict() for key, stats in sorted(self._calls.items())}
+        return {
+            "tools": {name: stats for (kind, name), stats in calls.items() if kind == "tool"},
+            "sdk_calls": {name: stats for (kind, name), stats in calls.items() if kind == "sdk"},
+            "caches": {name: cache.stats() for name, cache in self._caches.items()},
+            "slow_calls": list(self.profiler.slow_calls) if self.profiler is not None else [],
+        }
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            calls = sorted(self._calls.items())
+            for kind, label in (("tool", "tool"), ("sdk", "call")):
+                selected = [(name, stats) for (call_kind, name), stats in calls if call_kind == kind]
+                metric = f"{METRIC_PREFIX}_{kind}_duration_seconds"
+                lines += [f"# HELP {metric} Duration of {kind} calls.", f"# TYPE {metric} histogram"]
+                for name, stats in selected:
+                    labels = f'{label}="{_escape(name)}"'
+                    for bound, total in stats.latency.cumulative():
+                        lines.append(f'{metric}_bucket{{{labels},le="{bound:g}"}} {total}')
+                    lines.append(f'{metric}_bucket{{{labels},le="+Inf"}} {stats.latency.count}')
+                    lines.append(f"{metric}_sum{{{labels}}} {stats.latency.sum:.6f}")
+                    lines.append(f"{metric}_count{{{labels}}} {stats.latency.count}")
+                for suffix, attribute, description in (
+                    ("errors_total", "errors", f"Number of failed {kind} calls."),
+                    ("timeouts_total", "timeouts", f"Number of timed out {kind} calls."),
+                    ("payload_bytes_total", "payload_bytes", f"Bytes of responses of {kind} calls."),
+                ):
+                    metric = f"{METRIC_PREFIX}_{kind}_{suffix}"
+                    lines += [f"# HELP {metric} {description}", f"# TYPE {metric} counter"]
+                    for name, stats in selected:
+                        lines.append(f'{metric}{{{label}="{_escape(name)}"}} {getattr(stats, attribute)}')
+        cache_stats = {name: cache.stats() for name, cache in self._caches.items()}
+        for key, metric_type in (("hits", "counter"), ("misses", "counter"), ("evictions", "counter"), ("hit_rate", "gauge"), ("entries", "gauge")):
+            metric = f"{METRIC_PREFIX}_cache_{key}" + ("_total" if metric_type == "counter" else "")
+            lines += [f"# HELP {metric} Cache {key.replace('_', ' ')}.", f"# TYPE {metric} {metric_type}"]
+            for name, stats in cache_stats.items():
+                lines.append(f'{metric}{{cache="{_escape(name)}"}} {stats[key]}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class InstrumentedClient:
+    """
+    Proxy of a GoodData SDK object recording every method call in `metrics` under its attribute
+    path (e.g. "catalog_workspace_content.get_declarative_ldm"). Nested API objects are proxied
+    too; streamed responses are timed until they are exhausted or closed.
+
+    Args:
+        target: GoodDataSdk (or any object reachable from it)
+        metrics: Where the calls are recorded
+        path: Attribute path of `target`
+    """
+
+    def __init__(self, target: Any, metrics: Metrics, path: str = ""):
+        object.__setattr__(self, "_target", target)
+        object.__setattr__(self, "_metrics", metrics)
+        object.__setattr__(self, "_path", path)
+
+    def __getattr__(self, name: str) -> Any:
+        value = getattr(self._target, name)
+        path = f"{self._path}.{name}" if self._path else name
+        if name.startswith("_") or value is None or isinstance(value, (str, bytes, int, float, bool, dict, list, tuple)) or inspect.isclass(value):
+            return value
+        if callable(value):
+            return self._wrap_method(value, path)
+        return InstrumentedClient(value, self._metrics, path)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._target, name, value)
+
+    def _wrap_method(self, method, path: str):
+        metrics = self._metrics
+
+        def call(*args, **kwargs):
+            with metrics.track("sdk", path) as record:
+                result = method(*args, **kwargs)
+                if inspect.isgenerator(result):
+                    return _instrumented_stream(result, metrics, path)
+                if metrics.measure_payloads:
+                    record.payload_bytes = payload_size(result)
+                return result
+        return call
+
+
+def _instrumented_stream(stream, metrics: Metrics, path: str):
+    # The initial call only opened the stream; the stream itself is recorded as a separate call
+    with metrics.track("sdk", f"{path}[stream]") as record:
+        try:
+            for chunk in stream:
+                if metrics.measure_payloads:
+                    record.payload_bytes += payload_size(chunk)
+                yield chunk
+        finally:
+            stream.close()
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from gooddata_sdk import CatalogDeclarativeDataset
+
+# Bump when the checks change so that results stored by an older version are not reused
+AUDIT_VERSION = 2
+
+AUDIT_KEYS = (
+    "missing_descriptions_attributes",
+    "missing_descriptions_facts",
+    "obfuscated_title_attributes",
+    "obfuscated_title_facts",
+)
+
+
+def _fingerprint(payload) -> str:
+    data = json.dumps([AUDIT_VERSION, payload], sort_keys=True, default=str)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def audit_dataset(dataset: "CatalogDeclarativeDataset") -> dict:
+    """
+    Run the per-item quality checks on a single dataset.
+
+    The checks are cheap string tests, so they are recomputed on every call; hashing the dataset
+    to look up a stored result would cost more than the checks themselves.
+
+    Args:
+        dataset: A CatalogDeclarativeDataset
+
+    Returns:
+        dict: Lists of findings keyed by AUDIT_KEYS
+    """
+    # The checks import the GoodData SDK, load them only when an audit actually runs
+    from ldm_quality_check import has_no_description, obfuscated_title_check
+    result = {key: [] for key in AUDIT_KEYS}
+    for kind, items in (("attributes", dataset.attributes or []), ("facts", dataset.facts or [])):
+        for item in items:
+            if has_no_description(item):
+                result[f"missing_descriptions_{kind}"].append({"title": item.title, "id": item.id})
+            obfuscated_title_result = obfuscated_title_check(item)
+            if obfuscated_title_result.is_obfuscated:
+                result[f"obfuscated_title_{kind}"].append({"title": item.title, "reason": obfuscated_title_result.reason, "id": item.id})
+    return result
+
+
+@dataclass
+class AuditStore:
+    """
+    Latest audit result per slot (e.g. one workspace and kind), persisted as one small JSON file per slot.
+
+    A slot keeps only the result of its latest fingerprint, so edits do not pile up old results and
+    every write touches only the file of its own slot. Several server processes may share the
+    directory: a write goes to a temporary file that then replaces the slot file, so readers never
+    see a partial file, and the last writer wins.
+
+    Args:
+        path: Directory of the slot files; None keeps results in memory only
+        max_entries: Slots kept in memory when there is no directory; least recently written ones are dropped
+    """
+    path: Path | None = None
+    max_entries: int = 256
+    _results: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _slot_path(self, slot: str) -> Path:
+        return self.path / f"{hashlib.sha256(slot.encode()).hexdigest()[:32]}.json"
+
+    def get(self, slot: str, fingerprint: str):
+        """Return the stored result of a slot if it was computed for `fingerprint`, otherwise None."""
+        if self.path is None:
+            with self._lock:
+                entry = self._results.get(slot)
+        else:
+            try:
+                entry = json.loads(self._slot_path(slot).read_text())
+            except (OSError, ValueError):
+                # A missing or corrupted slot only costs a recomputation
+                entry = None
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return None
+        return entry["value"]
+
+    def put(self, slot: str, fingerprint: str, value) -> None:
+        """Replace the result of a slot."""
+        entry = {"slot": slot, "fingerprint": fingerprint, "value": value}
+        if self.path is None:
+            with self._lock:
+                self._results.pop(slot, None)
+                self._results[slot] = entry
+                while len(self._results) > self.max_entries:
+                    self._results.popitem(last=False)
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=self.path, suffix=".tmp", delete=False) as tmp_file:
+            tmp_file.write(json.dumps(entry))
+        try:
+            os.replace(tmp_file.name, self._slot_path(slot))
+        except OSError:
+            os.unlink(tmp_file.name)
+            raise
+
+
+def audit_similarity(scope: str, kind: str, items: list, store: AuditStore, candidate_threshold: float | None = None, exact: bool = False) -> list:
+    """
+    Find similar titles among all attributes or facts of the workspace, reusing the stored
+    result while none of the titles changed.
+
+    Args:
+        scope: Workspace the items belong to; the store keeps one result per scope and kind
+        kind: "attributes" or "facts"
+        items: All attributes or all facts of the workspace
+        store: Store of previous results
+        candidate_threshold: Trigram candidate threshold, see find_similar_titles
+        exact: Find every pair the pairwise check finds, see find_similar_titles
+
+    Returns:
+        list: Pairs of similar items as returned by semantic_similarity_check
+    """
+    from ldm_quality_check import semantic_similarity_check
+
+    fingerprint = _fingerprint(["similarity", kind, candidate_threshold, exact, [(item.id, item.title) for item in items]])
+    slot = f"{scope}/{kind}"
+    pairs = store.get(slot, fingerprint)
+    if pairs is None:
+        pairs = semantic_similarity_check(items, candidate_threshold=candidate_threshold, exact=exact).semantically_similar_pairs
+        store.put(slot, fingerprint, pairs)
+    # JSON turns the pair tuples into lists, keep the shape the check returns
+    return [tuple(pair) for pair in pairs]
@@ -0,0 +1,111 @@
+from dataclasses import dataclass, field
+from typing import Any
+
+# Order in which object types are preferred when an id is shared by several objects
+# (e.g. an attribute and its default label commonly have the same id)
+OBJECT_TYPES = ("dataset", "attribute", "fact", "label")
+
+
+@dataclass
+class LdmObject:
+    object_type: str
+    obj: Any
+    dataset: Any
+    attribute: Any = None
+
+    @property
+    def id(self) -> str:
+        return self.obj.id
+
+    @property
+    def source_table(self) -> str | None:
+        table_id = getattr(self.dataset, "data_source_table_id", None)
+        if table_id is None or not getattr(table_id, "path", None):
+            return None
+        return table_id.path[-1]
+
+    @property
+    def data_source_id(self) -> str | None:
+        """Data source of the dataset's table; workspaces of one host often map to different data sources."""
+        table_id = getattr(self.dataset, "data_source_table_id", None)
+        return getattr(table_id, "data_source_id", None) if table_id is not None else None
+
+    @property
+    def source_column(self) -> str | None:
+        return getattr(self.obj, "source_column", None)
+
+
+@dataclass
+class LdmIndex:
+    """
+    Lookup tables over a declarative LDM, built once per LDM version.
+
+    Attributes:
+        ldm: The declarative LDM the index was built from
+        by_id: Object id -> objects with that id, ordered by OBJECT_TYPES
+        by_type_and_id: (object type, object id) -> object
+        by_source: (source table, source column) -> objects reading that column
+        by_dataset: Dataset id -> dataset
+    """
+    ldm: Any = None
+    by_id: dict[str, list[LdmObject]] = field(default_factory=dict)
+    by_type_and_id: dict[tuple[str, str], LdmObject] = field(default_factory=dict)
+    by_source: dict[tuple[str, str], list[LdmObject]] = field(default_factory=dict)
+    by_dataset: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, declarative_ldm) -> "LdmIndex":
+        """
+        Build the index from a CatalogDeclarativeModel.
+
+        Args:
+            declarative_ldm: Declarative LDM as returned by get_declarative_ldm
+
+        Returns:
+            LdmIndex: Index over datasets, attributes, facts and labels
+        """
+        index = cls(ldm=declarative_ldm)
+        for ds in getattr(declarative_ldm.ldm, "datasets", None) or []:
+            index.by_dataset[ds.id] = ds
+            index._add(LdmObject("dataset", ds, ds))
+            for attr in getattr(ds, "attributes", None) or []:
+                index._add(LdmObject("attribute", attr, ds))
+                for label in getattr(attr, "labels", None) or []:
+                    index._add(LdmObject("label", label, ds, attribute=attr))
+            for fact in getattr(ds, "facts", None) or []:
+                index._add(LdmObject("fact", fact, ds))
+        for objects in index.by_id.values():
+            objects.sort(key=lambda o: OBJECT_TYPES.index(o.object_type))
+        return index
+
+    def _add(self, ldm_object: LdmObject) -> None:
+        self.by_id.setdefault(ldm_object.id, []).append(ldm_object)
+        self.by_type_and_id[(ldm_object.object_type, ldm_object.id)] = ldm_object
+        if ldm_object.source_column and ldm_object.source_table:
+            self.by_source.setdefault((ldm_object.source_table, ldm_object.source_column), []).append(ldm_object)
+
+    def find(self, object_id: str, object_type: str | None = None, dataset_id: str | None = None) -> LdmObject | None:
+        """
+        Find an LDM object by id.
+
+        Args:
+            object_id: Id of the dataset, attribute, fact or label
+            object_type: Restrict the lookup to one of OBJECT_TYPES
+            dataset_id: Restrict the lookup to objects of the given dataset
+
+        Returns:
+            LdmObject | None: The matching object with the highest type priority, or None
+        """
+        if object_type is not None and dataset_id is None:
+            return self.by_type_and_id.get((object_type, object_id))
+        for ldm_object in self.by_id.get(object_id, []):
+            if object_type is not None and ldm_object.object_type != object_type:
+                continue
+            if dataset_id is not None and ldm_object.dataset.id != dataset_id:
+                continue
+            return ldm_object
+        return None
+
+    def find_by_source(self, table: str, column: str) -> list[LdmObject]:
+        """Return all objects mapped to the given source table column."""
+        return self.by_source.get((table, column), [])
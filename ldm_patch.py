@@ -0,0 +1,143 @@
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from ldm_index import OBJECT_TYPES, LdmIndex
+
+
+@dataclass
+class LdmEdit:
+    object_id: str
+    title: str | None = None
+    description: str | None = None
+    object_type: str | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LdmEdit":
+        if not isinstance(data, dict):
+            raise ValueError(f"Edit must be an object with object_id, title, description and object_type, got {type(data).__name__}")
+        unknown = set(data) - {"object_id", "title", "description", "object_type"}
+        if unknown:
+            raise ValueError(f"Unknown keys {', '.join(sorted(unknown))}")
+        if not data.get("object_id"):
+            raise ValueError("object_id is required")
+        return cls(**data)
+
+
+def apply_edit(index: LdmIndex, edit: LdmEdit) -> dict:
+    """
+    Apply a single title/description edit to the in-memory LDM the index was built from.
+
+    Args:
+        index: Index over the LDM to edit
+        edit: The edit
+
+    Returns:
+        dict: {"object_id", "status": "OK", "object_type"} or {"object_id", "error"}
+    """
+    if edit.object_type is not None and edit.object_type not in OBJECT_TYPES:
+        return {"object_id": edit.object_id, "error": f"Unsupported object type {edit.object_type}, expected one of {', '.join(OBJECT_TYPES)}"}
+    if not edit.title and not edit.description:
+        return {"object_id": edit.object_id, "error": "Nothing to patch, provide a title or a description"}
+    ldm_object = index.find(edit.object_id, object_type=edit.object_type)
+    if ldm_object is None:
+        return {"object_id": edit.object_id, "error": "Field not found"}
+    if edit.title:
+        ldm_object.obj.title = edit.title
+    if edit.description:
+        ldm_object.obj.description = edit.description
+    return {"object_id": edit.object_id, "status": "OK", "object_type": ldm_object.object_type}
+
+
+def apply_edits(load_index: Callable[[], LdmIndex], put_ldm: Callable[[Any], None], edits: list[LdmEdit]) -> list[dict]:
+    """
+    Apply edits against one fetched LDM and upload it once.
+
+    Args:
+        load_index: Returns the index over a freshly fetched LDM; it is edited in place and uploaded
+        put_ldm: Uploads the edited declarative LDM
+        edits: Edits to apply, in order
+
+    Returns:
+        list[dict]: Result per edit, in the order of `edits`
+    """
+    index = load_index()
+    results = [apply_edit(index, edit) for edit in edits]
+    if any("status" in result for result in results):
+        try:
+            put_ldm(index.ldm)
+        except Exception as e:
+            # Nothing was persisted, so no edit succeeded
+            results = [{"object_id": result["object_id"], "error": result.get("error", str(e))} for result in results]
+    return results
+
+
+class CoalescingLdmWriter:
+    """
+    Write-behind queue for LDM edits.
+
+    Edits submitted within `delay_seconds` of each other are applied to one fetched LDM
+    and persisted with a single upload. With a delay of 0 each edit is written right away.
+
+    Args:
+        load_index: Returns the index over a freshly fetched LDM; it is edited in place and uploaded
+        put_ldm: Uploads the edited declarative LDM
+        delay_seconds: How long to wait for more edits before writing
+    """
+
+    def __init__(self, load_index: Callable[[], LdmIndex], put_ldm: Callable[[Any], None], delay_seconds: float = 0.0):
+        self.load_index = load_index
+        self.put_ldm = put_ldm
+        self.delay_seconds = delay_seconds
+        self._pending: list[tuple[LdmEdit, Future]] = []
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        # Only one batch is written at a time so batches cannot overwrite each other
+        self._write_lock = threading.Lock()
+
+    def submit(self, edit: LdmEdit) -> dict:
+        """Queue an edit and wait until the batch containing it was written; returns the edit result."""
+        return self.submit_many([edit])[0]
+
+    def submit_many(self, edits: list[LdmEdit], immediate: bool = False) -> list[dict]:
+        """
+        Queue edits and wait until they were written.
+
+        Args:
+            edits: Edits to apply, in order
+            immediate: Write right away together with anything already pending instead of waiting for more edits
+
+        Returns:
+            list[dict]: Result per edit, in the order of `edits`
+        """
+        futures = [Future() for _ in edits]
+        flush_now = immediate or self.delay_seconds <= 0
+        with self._lock:
+            self._pending.extend(zip(edits, futures))
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.delay_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+        return [future.result() for future in futures]
+
+    def flush(self) -> None:
+        """Write all pending edits in one batch."""
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not batch:
+                return
+            try:
+                results = apply_edits(self.load_index, self.put_ldm, [edit for edit, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                return
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
@@ -2,6 +2,7 @@ from gooddata_sdk import CatalogDeclarativeAttribute, CatalogDeclarativeFact
 from dataclasses import dataclass
 import re
 from difflib import SequenceMatcher
+from title_similarity import find_similar_titles
 
 @dataclass
 class ObfuscatedTitle:
@@ -71,21 +72,27 @@ def obfuscated_title_check(item: CatalogDeclarativeAttribute | CatalogDeclarativ
         
     return ObfuscatedTitle(is_obfuscated=False)
 
-def semantic_similarity_check(items: list[CatalogDeclarativeAttribute] | list[CatalogDeclarativeFact]) -> SemanticallySimilar:
+def semantic_similarity_check(items: list[CatalogDeclarativeAttribute] | list[CatalogDeclarativeFact], threshold: float = 0.8,
+                              candidate_threshold: float | None = None, exact: bool = False) -> SemanticallySimilar:
     """
     Check if the titles of attributes or facts are semantically similar.
-    
+
+    Pairs are found with find_similar_titles, which prunes unlikely pairs before applying
+    the same check as check_semantic_similarity, so items from the whole workspace can be
+    passed at once. Pairs with a short title are always found; unless exact is set, the pruning
+    may miss some pairs of long titles.
+
     Args:
         items: A list of CatalogDeclarativeAttribute or CatalogDeclarativeFact objects
+        threshold: Similarity threshold (0.0 to 1.0)
+        candidate_threshold: Trigram candidate threshold, see find_similar_titles
+        exact: Find every pair the pairwise check finds, see find_similar_titles
         
     Returns:
-        bool: True if titles are similar, False otherwise
-    """        
+        SemanticallySimilar: Pairs of items with similar titles
+    """
     similar = []
-    for i, item1 in enumerate(items):            
-        for item2 in items[i + 1:]:
-            if check_semantic_similarity(item1.title, item2.title):
-                similar.append(({"title": item1.title, "id": item1.id}, {"title": item2.title, "id": item2.id}))
+    for i, j in find_similar_titles([item.title for item in items], threshold, candidate_threshold, exact):
+        item1, item2 = items[i], items[j]
+        similar.append(({"title": item1.title, "id": item1.id}, {"title": item2.title, "id": item2.id}))
     return SemanticallySimilar(similar)
-
-    
\ No newline at end of file
@@ -0,0 +1,214 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    loaded_at: float
+    generation: int
+    # Generations of the source entries a derived value was built from (None for plain entries)
+    source_generation: tuple[int, ...] | None = None
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    # Requests that waited for a load already in progress instead of starting their own
+    coalesced: int = 0
+    entries: int = 0
+
+    def to_dict(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "coalesced": self.coalesced,
+            "entries": self.entries,
+        }
+
+
+@dataclass
+class MetadataCache:
+    """
+    In-process cache for declarative GoodData documents (LDM, analytics model, dependency graph) and indexes built from them.
+
+    Keys are tuples of (kind, workspace_id, ...). Entries expire after `ttl_seconds`,
+    the least recently used entry is evicted once `max_entries` is exceeded, and all
+    entries of a workspace can be dropped explicitly after we write to it. Concurrent
+    requests for the same missing key share a single load.
+
+    Args:
+        ttl_seconds: Time to live of an entry; 0 disables caching entirely
+        max_entries: Maximum number of entries kept in memory
+    """
+    ttl_seconds: float = 300.0
+    max_entries: int = 32
+    _entries: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _stats: CacheStats = field(default_factory=CacheStats, init=False, repr=False)
+    _generation: int = field(default=0, init=False, repr=False)
+    _loading: dict = field(default_factory=dict, init=False, repr=False)
+    _invalidation_epoch: int = field(default=0, init=False, repr=False)
+
+    def _lookup(self, key: Hashable) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry.loaded_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _store(self, key: Hashable, value: Any, source_generation: int | None = None) -> CacheEntry:
+        self._generation += 1
+        entry = CacheEntry(value, time.monotonic(), self._generation, source_generation)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+        return entry
+
+    def _get_entry(self, key: Hashable, loader: Callable[[], Any]) -> CacheEntry:
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self._stats.hits += 1
+                return entry
+            in_flight = self._loading.get(key)
+            if in_flight is None:
+                self._stats.misses += 1
+                in_flight = self._loading[key] = Future()
+                epoch = self._invalidation_epoch
+                owner = True
+            else:
+                self._stats.coalesced += 1
+                owner = False
+        if not owner:
+            return in_flight.result()
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._loading[key]
+            in_flight.set_exception(e)
+            raise
+        with self._lock:
+            del self._loading[key]
+            if self.ttl_seconds <= 0 or epoch != self._invalidation_epoch:
+                # Not cached: caching is disabled, or a write invalidated the workspace while we were loading
+                self._generation += 1
+                entry = CacheEntry(value, time.monotonic(), self._generation)
+            else:
+                entry = self._store(key, value)
+        in_flight.set_result(entry)
+        return entry
+
+    def get(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key`, calling `loader` on a miss or after expiry.
+
+        Args:
+            key: Cache key, a tuple starting with (kind, workspace_id)
+            loader: Zero-argument callable fetching the fresh value
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        return self._get_entry(key, loader).value
+
+    def peek(self, key: Hashable) -> Any | None:
+        """Return the cached value for `key` without loading it, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._stats.hits += 1
+            return entry.value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value that was loaded outside of the cache (e.g. several entries fetched at once)."""
+        with self._lock:
+            if self.ttl_seconds > 0:
+                self._store(key, value)
+
+    def derive(self, key: Hashable, source_key: Hashable, loader: Callable[[], Any], builder: Callable[[Any], Any]) -> Any:
+        """
+        Return a value derived from another cache entry (e.g. an index over the LDM).
+
+        The derived value is rebuilt whenever the source entry is reloaded, so it always
+        matches the version of the document it was built from.
+
+        Args:
+            key: Cache key of the derived value
+            source_key: Cache key of the source document
+            loader: Loader of the source document
+            builder: Callable building the derived value from the source document
+
+        Returns:
+            The derived value
+        """
+        return self.derive_many(key, [(source_key, loader)], builder)
+
+    def derive_many(self, key: Hashable, sources: list[tuple[Hashable, Callable[[], Any]]], builder: Callable[..., Any]) -> Any:
+        """
+        Return a value derived from several cache entries, rebuilt whenever any of them is reloaded.
+
+        Args:
+            key: Cache key of the derived value
+            sources: (cache key, loader) of every source document
+            builder: Callable building the derived value, called with the source documents in order
+
+        Returns:
+            The derived value
+        """
+        source_entries = [self._get_entry(source_key, loader) for source_key, loader in sources]
+        source_generation = tuple(entry.generation for entry in source_entries)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None and entry.source_generation == source_generation:
+                self._stats.hits += 1
+                return entry.value
+            self._stats.misses += 1
+        value = builder(*(entry.value for entry in source_entries))
+        with self._lock:
+            if self.ttl_seconds > 0:
+                self._store(key, value, source_generation=source_generation)
+        return value
+
+    def invalidate(self, workspace_id: str | None = None, kinds: set[str] | None = None) -> None:
+        """
+        Drop cached entries of a workspace, or all entries if no workspace is given.
+
+        Args:
+            workspace_id: Workspace whose entries should be dropped
+            kinds: Only drop entries of these kinds (e.g. {"analytics_model"}); derived
+                values are rebuilt automatically once their source is reloaded
+        """
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if (workspace_id is None or key[1] == workspace_id) and (kinds is None or key[0] in kinds)
+            ]
+            for key in keys:
+                del self._entries[key]
+            self._stats.invalidations += len(keys)
+            self._invalidation_epoch += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._stats.entries = len(self._entries)
+            return self._stats.to_dict()
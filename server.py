@@ -1,12 +1,27 @@
+import contextvars
+import functools
+import itertools
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
 from dotenv import load_dotenv
-from mcp.server.fastmcp import FastMCP
-import yaml
-from gooddata_sdk import GoodDataSdk, CatalogDependentEntitiesRequest, CatalogEntityIdentifier
-from gooddata_api_client.model.scan_sql_request import ScanSqlRequest
-from ldm_quality_check import has_no_description, obfuscated_title_check, semantic_similarity_check
-from visualization_converter import convert
+from mcp.server.fastmcp import Context, FastMCP
+from ldm_audit import AUDIT_KEYS, AuditStore, audit_dataset, audit_similarity
+from visualization_converter import convert_all
+from metadata_cache import MetadataCache
+from ldm_index import LdmIndex
+from dependency_graph import DependencyGraphIndex
+from ldm_patch import CoalescingLdmWriter, LdmEdit
+from column_profile import ColumnProfiler
+from catalog_search import EXACT_TITLE_SCORE, CatalogSearchIndex
+from tool_runtime import ToolRunner, run_coroutine
+from instrumentation import InstrumentedClient, Metrics
+from tool_output import OUTPUT_FORMATS, ResultPages, serialize, to_yaml
+from workspace_clients import ClientPool, Profile, WorkspaceRef, profiles_from_env
+from workspace_entities import create_visualization_object, get_dashboard_content, update_dashboard_content
 import uuid
 
 # Load environment variables from .env file
@@ -15,43 +30,224 @@ load_dotenv()
 # Initialize the MCP server
 mcp = FastMCP("Demo")
 
-# Initialize GoodData SDK using environment variables for host and token
-GD_HOST = os.environ.get("GOODDATA_HOST")
-GD_TOKEN = os.environ.get("GOODDATA_TOKEN")
-GD_WORKSPACE = os.environ.get("GOODDATA_WORKSPACE")
-GD_DATA_SOURCE = os.environ.get("GOODDATA_DATA_SOURCE")
-gd = GoodDataSdk.create(host_=GD_HOST, token_=GD_TOKEN)
+# Latency, errors and payload sizes of tool and SDK calls, see the performance_metrics tool
+metrics = Metrics.from_env(os.environ)
+
+# Tools run in a bounded thread pool so that a slow tool call does not block the others
+tool_runner = ToolRunner.from_env(os.environ, metrics=metrics)
+
+# Number of AI chat streams create_visualizations consumes at the same time
+VISUALIZATION_PARALLELISM = int(os.environ.get("GOODDATA_VISUALIZATION_PARALLELISM", "4"))
+
+# Number of workspaces audit_workspaces analyzes at the same time
+FANOUT_PARALLELISM = int(os.environ.get("GOODDATA_FANOUT_PARALLELISM", "4"))
+
+def _create_client(profile: Profile):
+    from gooddata_sdk import GoodDataSdk
+    return InstrumentedClient(GoodDataSdk.create(host_=profile.host, token_=profile.token), metrics)
+
+# Initialize GoodData SDK clients using environment variables for host and token: GOODDATA_HOST/GOODDATA_TOKEN
+# and GOODDATA_HOST__<PROFILE>/GOODDATA_TOKEN__<PROFILE>. A client is created on the first tool call that
+# needs it (importing the SDK dominates the server start-up) and then reused with its open connections.
+client_pool = ClientPool(profiles_from_env(os.environ), _create_client)
+
+def get_gd(profile: str | None = None):
+    """Return the GoodData SDK client (recorded in metrics) of a profile, the default one if no profile is given."""
+    return client_pool.get(profile)
+
+# Declarative documents are cached in-process so that consecutive tool calls do not re-download them
+metadata_cache = MetadataCache(
+    ttl_seconds=float(os.environ.get("GOODDATA_CACHE_TTL", "300")),
+    max_entries=int(os.environ.get("GOODDATA_CACHE_MAX_ENTRIES", "32")),
+)
+
+# Results of GoodData AI search, kept separately so that they do not evict the declarative documents
+search_cache = MetadataCache(
+    ttl_seconds=float(os.environ.get("GOODDATA_CACHE_TTL", "300")),
+    max_entries=int(os.environ.get("GOODDATA_SEARCH_CACHE_MAX_ENTRIES", "256")),
+)
+SEARCH_MODES = ("auto", "local", "ai", "hybrid")
+# Upper bound of local search results kept for paging
+SEARCH_MAX_RESULTS = int(os.environ.get("GOODDATA_SEARCH_MAX_RESULTS", "500"))
+
+# Long lists in tool results are returned in pages of GOODDATA_PAGE_SIZE items (a call may ask for up to
+# GOODDATA_MAX_PAGE_SIZE); the complete
+# results stay available to cursors for GOODDATA_CURSOR_TTL seconds
+result_pages = ResultPages(
+    MetadataCache(
+        ttl_seconds=float(os.environ.get("GOODDATA_CURSOR_TTL", "600")),
+        max_entries=int(os.environ.get("GOODDATA_CURSOR_MAX_ENTRIES", "64")),
+    ),
+    page_size=int(os.environ.get("GOODDATA_PAGE_SIZE", "50")),
+    max_page_size=int(os.environ.get("GOODDATA_MAX_PAGE_SIZE", "500")),
+)
+
+def _run_sql(ws: WorkspaceRef, data_source_id: str, sql: str) -> list[list]:
+    from gooddata_api_client.model.scan_sql_request import ScanSqlRequest
+    return get_gd(ws.profile).client.actions_api.scan_sql(data_source_id, ScanSqlRequest(sql=sql))["data_preview"]
+
+# Column profiles read bounded samples of the source tables and are reused for GOODDATA_PROFILE_TTL seconds
+profile_cache = MetadataCache(
+    ttl_seconds=float(os.environ.get("GOODDATA_PROFILE_TTL", "3600")),
+    max_entries=int(os.environ.get("GOODDATA_PROFILE_CACHE_MAX_ENTRIES", "2048")),
+)
+SAMPLE_METHOD = os.environ.get("GOODDATA_SAMPLE_METHOD", "limit")
+SAMPLE_ROWS = int(os.environ.get("GOODDATA_SAMPLE_ROWS", "10000"))
+SAMPLE_PERCENT = float(os.environ.get("GOODDATA_SAMPLE_PERCENT", "1"))
+
+def get_column_profiler(ws: WorkspaceRef, data_source_id: str) -> ColumnProfiler:
+    """Return a profiler querying the given data source through the workspace's profile; profiles are cached across calls."""
+    return ColumnProfiler(functools.partial(_run_sql, ws, data_source_id), profile_cache, method=SAMPLE_METHOD, sample_rows=SAMPLE_ROWS, sample_percent=SAMPLE_PERCENT)
+
+def _data_source_id(ws: WorkspaceRef, ldm_object) -> str:
+    """Data source the dataset of an LDM object is mapped to, the profile's GOODDATA_DATA_SOURCE if the LDM does not say."""
+    data_source_id = ldm_object.data_source_id or ws.data_source_id
+    if not data_source_id:
+        raise Exception(f"Dataset {ldm_object.dataset.id} names no data source and profile {ws.profile} has no GOODDATA_DATA_SOURCE")
+    return data_source_id
+
+metrics.register_cache("metadata", metadata_cache)
+metrics.register_cache("search", search_cache)
+metrics.register_cache("column_profile", profile_cache)
+metrics.register_cache("result_pages", result_pages.cache)
+
+# Similar titles found by analyze_ldm are persisted so that they are not searched again while no title changed
+audit_store = AuditStore(
+    path=Path(os.environ.get("GOODDATA_AUDIT_STORE", Path.home() / ".cache" / "mcp-gooddata" / "ldm_audit")),
+)
+# The similar title search finds every pair with a short title; pairs of long titles are pruned with trigrams,
+# which may miss some, unless exact mode is on (no pair missed, about 3 times slower on large workspaces)
+SIMILARITY_CANDIDATE_THRESHOLD = float(os.environ["GOODDATA_SIMILARITY_CANDIDATE_THRESHOLD"]) if os.environ.get("GOODDATA_SIMILARITY_CANDIDATE_THRESHOLD") else None
+SIMILARITY_EXACT = os.environ.get("GOODDATA_SIMILARITY_EXACT", "0") == "1"
+
+# Cache keys contain WorkspaceRef.key, i.e. the profile and the workspace id
+def _load_ldm(ws: WorkspaceRef):
+    return get_gd(ws.profile).catalog_workspace_content.get_declarative_ldm(workspace_id=ws.workspace_id)
+
+def _load_analytics_model(ws: WorkspaceRef):
+    return get_gd(ws.profile).catalog_workspace_content.get_declarative_analytics_model(workspace_id=ws.workspace_id)
+
+def _load_dependency_graph(ws: WorkspaceRef):
+    return get_gd(ws.profile).catalog_workspace_content.get_dependent_entities_graph(ws.workspace_id)
+
+def get_ldm(ws: WorkspaceRef):
+    """Return the declarative LDM of the workspace, served from the metadata cache when fresh."""
+    return metadata_cache.get(("ldm", ws.key), functools.partial(_load_ldm, ws))
+
+def get_ldm_index(ws: WorkspaceRef) -> LdmIndex:
+    """Return the lookup index over the declarative LDM, rebuilt only when a new LDM version is loaded."""
+    return metadata_cache.derive(("ldm_index", ws.key), ("ldm", ws.key), functools.partial(_load_ldm, ws), LdmIndex.build)
+
+def get_analytics_model(ws: WorkspaceRef):
+    """Return the declarative analytics model of the workspace, served from the metadata cache when fresh."""
+    return metadata_cache.get(("analytics_model", ws.key), functools.partial(_load_analytics_model, ws))
+
+def _index_metrics(declarative_analytics) -> dict:
+    metrics_by_id = {}
+    for m in declarative_analytics.analytics.metrics or []:
+        local_identifier = getattr(m, "local_identifier", None)
+        if local_identifier:
+            metrics_by_id.setdefault(local_identifier, m)
+        metrics_by_id[m.id] = m
+    return metrics_by_id
+
+def get_metrics_by_id(ws: WorkspaceRef) -> dict:
+    """Return metrics of the analytics model keyed by id (and local_identifier where present)."""
+    return metadata_cache.derive(("metrics_by_id", ws.key), ("analytics_model", ws.key), functools.partial(_load_analytics_model, ws), _index_metrics)
+
+def get_dependency_index(ws: WorkspaceRef) -> DependencyGraphIndex:
+    """Return adjacency lists over the workspace dependency graph, served from the metadata cache when fresh."""
+    return metadata_cache.derive(
+        ("dependency_index", ws.key),
+        ("dependency_graph", ws.key),
+        functools.partial(_load_dependency_graph, ws),
+        DependencyGraphIndex.build,
+    )
+
+def get_search_index(ws: WorkspaceRef) -> CatalogSearchIndex:
+    """Return the local search index over the LDM and analytics model, rebuilt when either of them is reloaded."""
+    return metadata_cache.derive_many(
+        ("search_index", ws.key),
+        [
+            (("ldm", ws.key), functools.partial(_load_ldm, ws)),
+            (("analytics_model", ws.key), functools.partial(_load_analytics_model, ws)),
+        ],
+        CatalogSearchIndex.build,
+    )
+
+def put_ldm(ws: WorkspaceRef, declarative_ldm) -> None:
+    """Persist the declarative LDM and drop the now outdated cached documents of the workspace."""
+    try:
+        get_gd(ws.profile).catalog_workspace_content.put_declarative_ldm(workspace_id=ws.workspace_id, ldm=declarative_ldm)
+    finally:
+        # A failed write may still have been applied partially, so drop the cached documents in any case
+        metadata_cache.invalidate(ws.key)
+        search_cache.invalidate(ws.key)
+
+def _load_ldm_index_for_write(ws: WorkspaceRef) -> LdmIndex:
+    """
+    Index over a freshly fetched LDM for edits. The whole LDM is uploaded again, so editing a cached copy
+    would overwrite changes made outside of this server since it was cached; the cached objects also stay untouched.
+    """
+    return LdmIndex.build(_load_ldm(ws))
+
+PATCH_COALESCE_SECONDS = float(os.environ.get("GOODDATA_PATCH_COALESCE_SECONDS", "0"))
+_ldm_writers: dict[tuple[str, str], CoalescingLdmWriter] = {}
+_ldm_writers_lock = threading.Lock()
+
+def get_ldm_writer(ws: WorkspaceRef) -> CoalescingLdmWriter:
+    """
+    Return the write-behind queue of LDM edits of the workspace; with a delay, concurrent patches
+    of the same workspace are uploaded together.
+    """
+    with _ldm_writers_lock:
+        if ws.key not in _ldm_writers:
+            _ldm_writers[ws.key] = CoalescingLdmWriter(
+                functools.partial(_load_ldm_index_for_write, ws),
+                functools.partial(put_ldm, ws),
+                delay_seconds=PATCH_COALESCE_SECONDS,
+            )
+        return _ldm_writers[ws.key]
+
+def invalidate_analytics(ws: WorkspaceRef) -> None:
+    """Drop cached analytics documents after a visualization or dashboard was written; the LDM stays cached."""
+    metadata_cache.invalidate(ws.key, kinds={"analytics_model", "dependency_graph"})
+    search_cache.invalidate(ws.key)
+
+def _audit_ldm(ws: WorkspaceRef, declarative_ldm) -> dict:
+    """Run the LDM quality checks; returns the findings keyed by AUDIT_KEYS plus similar_attributes and similar_facts."""
+    datasets = getattr(declarative_ldm.ldm, "datasets", [])
+    audits = [audit_dataset(ds) for ds in datasets]
+    findings = {key: [item for audit in audits for item in audit[key]] for key in AUDIT_KEYS}
+    # Titles are compared across all datasets of the workspace; the result is reused from the audit store while the titles are unchanged
+    scope = f"{ws.profile}/{ws.workspace_id}"
+    findings["similar_attributes"] = audit_similarity(
+        scope, "attributes", [attr for ds in datasets for attr in ds.attributes], audit_store, SIMILARITY_CANDIDATE_THRESHOLD, SIMILARITY_EXACT
+    )
+    findings["similar_facts"] = audit_similarity(
+        scope, "facts", [fact for ds in datasets for fact in ds.facts], audit_store, SIMILARITY_CANDIDATE_THRESHOLD, SIMILARITY_EXACT
+    )
+    return findings
 
 @mcp.tool(
     name="analyze_ldm",
-    description="Analyze the declarative Logical Data Model (LDM) for missing or well-defined descriptions on attributes and facts. Returns counts and examples."
+    description="Analyze the declarative Logical Data Model (LDM) for missing or well-defined descriptions on attributes and facts. Returns counts and examples. "
+                "Similar titles are returned in pages of `limit` pairs; pass the returned page.next_cursor as `cursor` to get the next page. format is 'yaml' (default) or 'json'. workspace_id and profile select another workspace or GoodData host than the configured default."
 )
-def analyze_ldm() -> dict:
+@tool_runner.offload(error_format=to_yaml)
+def analyze_ldm(limit: int | None = None, cursor: str | None = None, format: str = "yaml", workspace_id: str | None = None, profile: str | None = None) -> dict:
     """Analyze the declarative LDM for missing/well-defined descriptions of attributes and facts."""
     try:
-        declarative_ldm = gd.catalog_workspace_content.get_declarative_ldm(workspace_id=GD_WORKSPACE)
-        datasets = getattr(declarative_ldm.ldm, "datasets", [])
-        missing_descriptions_attributes = []
-        missing_descriptions_facts = []
-        obfuscated_title_attributes = []
-        obfuscated_title_facts = []
-        similar_attributes = []
-        similar_facts = []
-        for ds in datasets:
-            similar_attributes = semantic_similarity_check(ds.attributes).semantically_similar_pairs
-            similar_facts = semantic_similarity_check(ds.facts).semantically_similar_pairs
-            for attr in ds.attributes:
-                if has_no_description(attr):
-                    missing_descriptions_attributes.append({"title": attr.title, "id": attr.id})
-                obfuscated_title_result =  obfuscated_title_check(attr)
-                if obfuscated_title_result.is_obfuscated:
-                    obfuscated_title_attributes.append({"title": attr.title, "reason": obfuscated_title_result.reason, "id": attr.id})
-            for fact in ds.facts:
-                if has_no_description(fact):
-                    missing_descriptions_facts.append({"title": fact.title, "id": fact.id})
-                obfuscated_title_result =  obfuscated_title_check(fact)
-                if obfuscated_title_result.is_obfuscated:
-                    obfuscated_title_facts.append({"title": fact.title, "reason": obfuscated_title_result.reason, "id": fact.id})
+        if format not in OUTPUT_FORMATS:
+            return to_yaml({"error": f"Unsupported format {format}, expected one of {', '.join(OUTPUT_FORMATS)}"})
+        if cursor:
+            return serialize(result_pages.next("analyze_ldm", cursor, limit), format)
+        ws = client_pool.resolve(workspace_id, profile)
+        findings = _audit_ldm(ws, get_ldm(ws))
+        missing_descriptions_attributes = findings["missing_descriptions_attributes"]
+        missing_descriptions_facts = findings["missing_descriptions_facts"]
+        obfuscated_title_attributes = findings["obfuscated_title_attributes"]
+        obfuscated_title_facts = findings["obfuscated_title_facts"]
         result = {
             "missing_descriptions_attributes": len(missing_descriptions_attributes),
             "missing_descriptions_facts ": len(missing_descriptions_facts),
@@ -61,204 +257,448 @@ def analyze_ldm() -> dict:
             "obfuscated_title_facts": len(obfuscated_title_facts),
             "obfuscated_title_attributes_examples": obfuscated_title_attributes[:5],
             "obfuscated_title_facts_examples": obfuscated_title_facts[:5],
-            "similar_attributes": similar_attributes,
-            "similar_facts": similar_facts,
+            "similar_attributes": findings["similar_attributes"],
+            "similar_facts": findings["similar_facts"],
+        }
+        return serialize(result_pages.first("analyze_ldm", result, ("similar_attributes", "similar_facts"), limit), format)
+    except Exception as e:
+        return to_yaml({"error": str(e)})
+
+def _workspace_audit_summary(ws: WorkspaceRef) -> dict:
+    """Counts of the analyze_ldm findings of one workspace."""
+    # Reuse a cached LDM but do not cache the fetched ones, a fan-out over many workspaces would evict the working set
+    declarative_ldm = metadata_cache.peek(("ldm", ws.key)) or _load_ldm(ws)
+    counts = {key: len(items) for key, items in _audit_ldm(ws, declarative_ldm).items()}
+    return {"workspace_id": ws.workspace_id, "issues": sum(counts.values()), **counts}
+
+@mcp.tool(
+    name="audit_workspaces",
+    description="Run the analyze_ldm checks on many workspaces at once and return an aggregated report: totals over all workspaces and per-workspace counts, sorted by the number of issues. "
+                "Without workspace_ids all workspaces of the profile's host are audited. At most `parallelism` workspaces are fetched at the same time; it defaults to and is capped at GOODDATA_FANOUT_PARALLELISM. "
+                "Workspaces are returned in pages of `limit`; pass the returned page.next_cursor as `cursor` to get the next page. format is 'yaml' (default) or 'json'."
+)
+@tool_runner.offload(error_format=to_yaml)
+def audit_workspaces(workspace_ids: list[str] | None = None, profile: str | None = None, parallelism: int | None = None,
+                     limit: int | None = None, cursor: str | None = None, format: str = "yaml") -> dict:
+    """Audit the LDMs of several workspaces with bounded parallelism and aggregate the findings."""
+    try:
+        if format not in OUTPUT_FORMATS:
+            return to_yaml({"error": f"Unsupported format {format}, expected one of {', '.join(OUTPUT_FORMATS)}"})
+        if cursor:
+            return serialize(result_pages.next("audit_workspaces", cursor, limit), format)
+        if not workspace_ids:
+            workspace_ids = [workspace.id for workspace in get_gd(profile).catalog_workspace.list_workspaces()]
+        refs = [client_pool.resolve(workspace_id, profile) for workspace_id in dict.fromkeys(workspace_ids)]
+        summaries, errors = [], []
+        # The model may ask for any width, the configured one is the upper limit
+        workers = max(1, min(parallelism or FANOUT_PARALLELISM, FANOUT_PARALLELISM))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gooddata-fanout") as executor:
+            futures = [executor.submit(contextvars.copy_context().run, _workspace_audit_summary, ws) for ws in refs]
+            for ws, future in zip(refs, futures):
+                try:
+                    summaries.append(future.result())
+                except Exception as e:
+                    errors.append({"workspace_id": ws.workspace_id, "error": str(e)})
+        totals = {key: sum(summary[key] for summary in summaries) for key in ("issues", *AUDIT_KEYS, "similar_attributes", "similar_facts")}
+        result = {
+            "workspaces_audited": len(summaries),
+            "workspaces_failed": len(errors),
+            "totals": totals,
+            "workspaces": sorted(summaries, key=lambda summary: summary["issues"], reverse=True),
+            "errors": errors,
         }
-        return yaml.safe_dump(result, sort_keys=False, allow_unicode=True)
+        return serialize(result_pages.first("audit_workspaces", result, ("workspaces", "errors"), limit), format)
     except Exception as e:
-        return yaml.safe_dump({"error": str(e)}, sort_keys=False, allow_unicode=True)
+        return to_yaml({"error": str(e)})
 
 @mcp.tool(
     name="analyze_field",
-    description="Analyze the specific field in the Logical Data Model (LDM)"
+    description="Analyze the specific field in the Logical Data Model (LDM). workspace_id and profile select another workspace or GoodData host than the configured default."
 )
-def analyze_field(dataset_id: str, field_id: str) -> dict:
+@tool_runner.offload(error_format=to_yaml)
+def analyze_field(dataset_id: str, field_id: str, workspace_id: str | None = None, profile: str | None = None) -> dict:
     """Gather info about a specific field: DB name, dataset, title, description, and sample data."""
     try:
+        ws = client_pool.resolve(workspace_id, profile)
         # Fetch LDM info
-        declarative_ldm = gd.catalog_workspace_content.get_declarative_ldm(workspace_id=GD_WORKSPACE)
-        field_meta = None
-        for ds in getattr(declarative_ldm.ldm, "datasets", []):
-            if ds.id == dataset_id:
-                for attr in getattr(ds, "attributes", []):
-                    if attr.id == field_id:
-                        field_meta = {
-                            "dataset_id": ds.id,
-                            "dataset_title": ds.title,
-                            "field_id": attr.id,
-                            "field_title": attr.title,
-                            "field_description": getattr(attr, "description", None),
-                            "source_column": getattr(attr, "source_column", None),
-                            "source_table": ds.data_source_table_id.path[-1],
-                        }
-                        break
-                        
-        if not field_meta:
-            raise Exception(f"Field {field_id} not found in LDM")
-        # Sample data
-        sql_request = ScanSqlRequest(
-            sql=f"SELECT DISTINCT \"{field_meta['source_column']}\" FROM \"{field_meta['source_table']}\" ORDER BY RANDOM() LIMIT 10;",
+        index = get_ldm_index(ws)
+        field = next(
+            (f for f in (index.find(field_id, object_type=t, dataset_id=dataset_id) for t in ("attribute", "fact", "label")) if f),
+            None,
         )
-        result = gd.client.actions_api.scan_sql(GD_DATA_SOURCE, sql_request)
-        sample_data = ", ".join([row[0] for row in result["data_preview"]])
-        result = {"field_meta": field_meta, "sample_data": sample_data}
-        return yaml.safe_dump(result, sort_keys=False, allow_unicode=True)
+        if field is None:
+            raise Exception(f"Field {field_id} not found in LDM")
+        field_meta = {
+            "dataset_id": field.dataset.id,
+            "dataset_title": field.dataset.title,
+            "field_id": field.id,
+            "field_type": field.object_type,
+            "field_title": field.obj.title,
+            "field_description": getattr(field.obj, "description", None),
+            "source_column": field.source_column,
+            "source_table": field.source_table,
+        }
+        if not field_meta["source_table"] or not field_meta["source_column"]:
+            raise Exception(f"Field {field_id} is not mapped to a source table column")
+        # Sample data and basic statistics from a bounded sample of the table, cached per column
+        data_source_id = _data_source_id(ws, field)
+        column_profile = get_column_profiler(ws, data_source_id).profile(
+            f"{ws.profile}/{data_source_id}", field_meta["source_table"], [field_meta["source_column"]]
+        )[field_meta["source_column"]]
+        sample_data = ", ".join(column_profile.sample_values)
+        result = {"field_meta": field_meta, "sample_data": sample_data, "profile": column_profile.to_dict()}
+        return to_yaml(result)
     except Exception as e:
-        return yaml.safe_dump({"error": str(e)}, sort_keys=False, allow_unicode=True)
+        return to_yaml({"error": str(e)})
+
+@mcp.tool(
+    name="profile_dataset",
+    description="Profile the source columns of a dataset: sample values, distinct count estimate, null ratio, min and max. "
+                "All columns of the dataset's table are sampled together with bounded queries. Optionally restrict to field_ids. workspace_id and profile select another workspace or GoodData host than the configured default."
+)
+@tool_runner.offload(error_format=to_yaml)
+def profile_dataset(dataset_id: str, field_ids: list[str] | None = None, workspace_id: str | None = None, profile: str | None = None) -> dict:
+    """Profile the attributes, labels and facts of a dataset that map to columns of its source table."""
+    try:
+        ws = client_pool.resolve(workspace_id, profile)
+        index = get_ldm_index(ws)
+        dataset = index.by_dataset.get(dataset_id)
+        if dataset is None:
+            raise Exception(f"Dataset {dataset_id} not found in LDM")
+        fields = []
+        for attr in dataset.attributes or []:
+            fields.append(index.find(attr.id, object_type="attribute", dataset_id=dataset_id))
+            fields += [index.find(label.id, object_type="label", dataset_id=dataset_id) for label in attr.labels or []]
+        fields += [index.find(fact.id, object_type="fact", dataset_id=dataset_id) for fact in dataset.facts or []]
+        fields = [f for f in fields if f and f.source_column and (not field_ids or f.id in field_ids)]
+        if not fields:
+            raise Exception(f"No fields with a source column found in dataset {dataset_id}")
+        table = fields[0].source_table
+        if table is None:
+            raise Exception(f"Dataset {dataset_id} is not mapped to a source table")
+        data_source_id = _data_source_id(ws, fields[0])
+        profiles = get_column_profiler(ws, data_source_id).profile(f"{ws.profile}/{data_source_id}", table, [f.source_column for f in fields])
+        result = {
+            "dataset_id": dataset_id,
+            "source_table": table,
+            "fields": [
+                {"field_id": f.id, "field_type": f.object_type, "field_title": f.obj.title, **profiles[f.source_column].to_dict()}
+                for f in fields
+            ],
+        }
+        return to_yaml(result)
+    except Exception as e:
+        return to_yaml({"error": str(e)})
 
 @mcp.tool(
     name="patch_ldm",
-    description="Patch (update) the title and/or description of a dataset or attribute in the Logical Data Model (LDM). Persists changes."
+    description="Patch (update) the title and/or description of a dataset, attribute, fact or label in the Logical Data Model (LDM). Persists changes. workspace_id and profile select another workspace or GoodData host than the configured default."
 )
-def patch_ldm(object_id: str, title: str = None, description: str = None) -> dict:
-    """Patch the title and/or description of a dataset or attribute in the LDM."""
+@tool_runner.offload(writes=True)
+def patch_ldm(object_id: str, title: str = None, description: str = None, object_type: str = None, workspace_id: str | None = None, profile: str | None = None) -> dict:
+    """
+    Patch the title and/or description of a dataset, attribute, fact or label in the LDM.
+    When object_type is not given and several objects share the id, datasets win over attributes, facts and labels.
+    """
     try:
-        # Fetch current LDM
-        declarative_ldm = gd.catalog_workspace_content.get_declarative_ldm(workspace_id=GD_WORKSPACE)
-        updated = False
-        for ds in getattr(declarative_ldm.ldm, "datasets", []):
-            if ds.id == object_id:
-                if title:
-                    ds.title = title
-                if description:
-                    ds.description = description
-                updated = True
-                break
-            for attr in getattr(ds, "attributes", []):
-                if attr.id == object_id:
-                    if title:
-                        attr.title = title
-                    if description:
-                        attr.description = description
-                    updated = True
-                    break
-        if updated:
-            gd.catalog_workspace_content.put_declarative_ldm(workspace_id=GD_WORKSPACE, ldm=declarative_ldm)
-            return {"status": "OK"}
-        else:
-            return {"error": "Field not found"}
+        ws = client_pool.resolve(workspace_id, profile)
+        result = get_ldm_writer(ws).submit(LdmEdit(object_id, title=title, description=description, object_type=object_type))
+        result.pop("object_id")
+        return result
     except Exception as e:
         return {"error": str(e)}
 
+@mcp.tool(
+    name="patch_ldm_batch",
+    description="Patch titles and/or descriptions of many datasets, attributes, facts or labels in the Logical Data Model (LDM) with a single upload. Each edit is a dict with object_id and title and/or description (optionally object_type). Returns the result of every edit. workspace_id and profile select another workspace or GoodData host than the configured default."
+)
+@tool_runner.offload(writes=True)
+def patch_ldm_batch(edits: list[dict], workspace_id: str | None = None, profile: str | None = None) -> dict:
+    """Apply many title/description edits to one fetched LDM and persist them with a single PUT."""
+    try:
+        ws = client_pool.resolve(workspace_id, profile)
+        results = [None] * len(edits)
+        valid = []
+        for i, edit in enumerate(edits):
+            try:
+                valid.append((i, LdmEdit.from_dict(edit)))
+            except (TypeError, ValueError) as e:
+                results[i] = {"object_id": edit.get("object_id") if isinstance(edit, dict) else None, "error": str(e)}
+        for (i, _), result in zip(valid, get_ldm_writer(ws).submit_many([edit for _, edit in valid], immediate=True)):
+            results[i] = result
+        patched = sum(1 for result in results if "status" in result)
+        return {
+            "status": "OK" if patched == len(results) else "PARTIAL" if patched else "ERROR",
+            "patched_count": patched,
+            "failed_count": len(results) - patched,
+            "results": results,
+        }
+    except Exception as e:
+        return {"error": str(e)}
+
+def _explain_metric(metric_id: str, metrics_by_id: dict, dependency_index: DependencyGraphIndex, max_usages: int | None = 10) -> dict:
+    """Describe one metric: its MAQL, nested metrics it is built from, what it uses and where it is used (up to max_usages usages)."""
+    # 1. Find MAQL for the metric (try id and local_identifier)
+    found_metric = metrics_by_id.get(metric_id)
+    maql = found_metric.content.get("maql") if found_metric else None
+    description = found_metric.description if found_metric else None
+    key = (found_metric.id if found_metric else metric_id, "metric")
+
+    used_in = [(dependency_index.title(k), k[1]) for k in dependency_index.dependents(key)]
+    uses = [(dependency_index.title(k), k[1]) for k in dependency_index.dependencies(key)]
+    # 2. Unfold metrics referenced by the MAQL, including metrics referenced by those metrics
+    nested_metrics = []
+    for k in dependency_index.dependencies(key, transitive=True, through_types={"metric"}):
+        if k[1] != "metric":
+            continue
+        nested = metrics_by_id.get(k[0])
+        nested_metrics.append({
+            "id": k[0],
+            "title": dependency_index.title(k),
+            "maql": nested.content.get("maql") if nested else None,
+        })
+    # TODO: it would be helpful to fetch uses descriptions
+
+    return {
+        "metric_id": metric_id,
+        "maql": maql,
+        "description": description,
+        "usage_total_count": len(used_in),
+        "usage_example": used_in[:max_usages],  # by default limited to 10 usages for brevity
+        "uses": uses,
+        "uses_total_count": len(uses),
+        "nested_metrics": nested_metrics,
+    }
+
 @mcp.tool(
     name="explain_metric",
-    description="Explain how a given metric is computed, including its MAQL expression, description, and where it is used across dashboards and insights."
+    description="Explain how a given metric is computed, including its MAQL expression, description, nested metrics it is built from, and where it is used across dashboards and insights. "
+                "Usages, used objects and nested metrics are returned in pages of `limit` items; pass the returned page.next_cursor as `cursor` to get the next page. format is 'yaml' (default) or 'json'. workspace_id and profile select another workspace or GoodData host than the configured default."
 )
-def explain_metric(metric_id: str) -> dict:
+@tool_runner.offload()
+def explain_metric(metric_id: str, limit: int | None = None, cursor: str | None = None, format: str = "yaml", workspace_id: str | None = None, profile: str | None = None) -> dict:
     """
     Explain how a given metric is computed and where it is used.
-    Unfold nested metrics and translate MAQL (not implemented).
+    Unfolds nested metrics; translating MAQL to plain English is not implemented.
     """
     try:
-        declarative_analytics = gd.catalog_workspace_content.get_declarative_analytics_model(workspace_id=GD_WORKSPACE)
-        metrics = declarative_analytics.analytics.metrics
-
-        # 1. Find MAQL for the metric (try id and local_identifier)
-        maql = None
-        description = None
-        local_identifier = None
-        found_metric = None
-        for m in metrics:
-            if m.id == metric_id or getattr(m, "local_identifier", None) == metric_id:
-                maql = m.content.get("maql")
-                description = m.description
-                found_metric = m
-                break
-
-        result_dependencies = gd.catalog_workspace_content.get_dependent_entities_graph_from_entry_points(GD_WORKSPACE, CatalogDependentEntitiesRequest(identifiers=[CatalogEntityIdentifier(id=metric_id, type="metric")]))        
-        used_in = [(i.title, i.type) for i in result_dependencies.graph.nodes]
-        
-        whole_graph = gd.catalog_workspace_content.get_dependent_entities_graph(GD_WORKSPACE)
+        if format not in OUTPUT_FORMATS:
+            return {"error": f"Unsupported format {format}, expected one of {', '.join(OUTPUT_FORMATS)}"}
+        if cursor:
+            return serialize(result_pages.next("explain_metric", cursor, limit), format)
+        ws = client_pool.resolve(workspace_id, profile)
+        result = _explain_metric(metric_id, get_metrics_by_id(ws), get_dependency_index(ws), max_usages=None)
+        return serialize(result_pages.first("explain_metric", result, ("usage_example", "uses", "nested_metrics"), limit), format)
+    except Exception as e:
+        return {"error": str(e)}
 
-        uses_ids = [(edge[0].id, edge[0].type) for edge in whole_graph.graph.edges if edge[1].id == metric_id and edge[1].type == "metric"]
-        uses = [(i.title, i.type) for i in whole_graph.graph.nodes if (i.id, i.type) in uses_ids]
-        # TODO: it would be helpful to fetch uses descriptions
-        
-        result = {
-            "metric_id": metric_id,
-            "maql": maql,
-            "description": description,
-            "usage_total_count": len(used_in),
-            "usage_example": used_in[:10],  # limit to 10 usages for brevity
-            "uses": uses,
-            "uses_total_count": len(uses),
-        }
-        return yaml.safe_dump(result, sort_keys=False, allow_unicode=True)
+@mcp.tool(
+    name="explain_metrics",
+    description="Explain several metrics at once, answering all of them from a single download of the analytics model and dependency graph. Returns the same details as explain_metric for each metric. workspace_id and profile select another workspace or GoodData host than the configured default."
+)
+@tool_runner.offload()
+def explain_metrics(metric_ids: list[str], workspace_id: str | None = None, profile: str | None = None) -> dict:
+    """Explain how the given metrics are computed and where they are used."""
+    try:
+        ws = client_pool.resolve(workspace_id, profile)
+        metrics_by_id = get_metrics_by_id(ws)
+        dependency_index = get_dependency_index(ws)
+        result = {"metrics": [_explain_metric(metric_id, metrics_by_id, dependency_index) for metric_id in metric_ids]}
+        return to_yaml(result)
     except Exception as e:
         return {"error": str(e)}
 
+def _search_ai(ws: WorkspaceRef, term: str, types: list[str]) -> list[dict]:
+    """Search with GoodData AI; results are cached per (term, types) until the TTL expires or we write to the workspace."""
+    return search_cache.get(
+        ("search_ai", ws.key, term, tuple(sorted(types))),
+        lambda: [{
+            "id": result["id"],
+            "title": result["title"],
+            "description": result.get("description", None),
+            "type": result["type"],
+            "visualization_type": result.get("visualization_type", None),
+            "match_score": result.get("score", 0.0),
+        } for result in get_gd(ws.profile).compute.search_ai(workspace_id=ws.workspace_id, question=term, object_types=types).results],
+    )
+
+def _search(ws: WorkspaceRef, term: str, types: list[str], mode: str) -> list[dict]:
+    local = get_search_index(ws).search(term, types, limit=SEARCH_MAX_RESULTS) if mode != "ai" else []
+    if mode == "local" or (mode == "auto" and local and local[0]["match_score"] >= EXACT_TITLE_SCORE):
+        return local
+    remote = _search_ai(ws, term, types)
+    if mode != "hybrid":
+        return remote
+    merged = {}
+    for result in local + remote:
+        key = (result["id"], result["type"])
+        if key not in merged or result["match_score"] > merged[key]["match_score"]:
+            merged[key] = result
+    return sorted(merged.values(), key=lambda result: -result["match_score"])
+
 @mcp.tool(
     name="search",
-    description="Search facts, metrics, attributes, date instances, visualizations or dashboards in the workspace."
+    description="Search facts, metrics, attributes, date instances, visualizations or dashboards in the workspace. "
+                "mode='auto' (default) answers exact id/title matches from a local index and falls back to GoodData AI search, "
+                "'local' only uses the local index, 'ai' only GoodData AI search and 'hybrid' merges both. "
+                "Results are returned in pages of `limit` items; pass the returned page.next_cursor as `cursor` to get the next page. "
+                "format 'yaml' or 'json' returns the result serialized as text. workspace_id and profile select another workspace or GoodData host than the configured default."
 )
-def search(term: str, types: list[str] = []) -> dict:
+@tool_runner.offload()
+def search(term: str, types: list[str] = [], mode: str = "auto", limit: int | None = None, cursor: str | None = None, format: str | None = None, workspace_id: str | None = None, profile: str | None = None) -> dict:
     """
     Use the GoodData SDK to search for facts, metrics, attributes, date instances, visualizations or dashboards in the workspace.
     """
     try:
-        return {
-            "result": [{
-                "id": result["id"],
-                "title": result["title"],
-                "description": result.get("description", None),
-                "type": result["type"],
-                "visualization_type": result.get("visualization_type", None),
-                "match_score": result.get("score", 0.0),
-            } for result in gd.compute.search_ai(workspace_id=GD_WORKSPACE, question=term, object_types=types).results]
-        }
+        if mode not in SEARCH_MODES:
+            return {"error": f"Unsupported search mode {mode}, expected one of {', '.join(SEARCH_MODES)}"}
+        if format is not None and format not in OUTPUT_FORMATS:
+            return {"error": f"Unsupported format {format}, expected one of {', '.join(OUTPUT_FORMATS)}"}
+        if cursor:
+            page = result_pages.next("search", cursor, limit)
+        else:
+            page = result_pages.first("search", {"result": _search(client_pool.resolve(workspace_id, profile), term, types, mode)}, ("result",), limit)
+        return serialize(page, format) if format else page
     except Exception as e:
         return {"error": str(e)}
 
+def _progress_reporter(ctx: Context | None) -> Callable[[], None]:
+    """Return a callback reporting the number of received AI chat chunks to the MCP client."""
+    received = itertools.count(1)
+    def report() -> None:
+        if ctx is not None:
+            run_coroutine(ctx.report_progress(next(received)))
+    return report
+
+def _generate_visualization(ws: WorkspaceRef, prompt: str, on_chunk: Callable[[], None] | None = None) -> dict:
+    """
+    Ask GoodData AI for a visualization and convert it, without storing it.
+    The chat stream is consumed lazily and closed as soon as the visualization arrives.
+    """
+    stream = get_gd(ws.profile).compute.ai_chat_stream(workspace_id=ws.workspace_id, question=prompt)
+    visualization = None
+    try:
+        for chunk in stream:
+            if on_chunk is not None:
+                on_chunk()
+            if "createdVisualizations" in chunk:
+                visualization = chunk.get("createdVisualizations", {})
+                break
+    finally:
+        # Stop the AI response early, the rest of it is not needed
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+    if visualization is None:
+        return {"error": "No visualization object found in AI chat output."}
+    visualizations = convert_all(visualization)
+    if len(visualizations) == 0:
+        return {"error": "Conversion failed."}
+    return {"visualizations": visualizations}
+
+def _visualization_result(ws: WorkspaceRef, visualization: dict, created: bool) -> dict:
+    return {
+        "message": f"Visualization '{visualization.get('title')}' " + ("added to workspace." if created else "already exists in workspace."),
+        "id": visualization.get("id"),
+        "url": f"{ws.host}/analyze/#/{ws.workspace_id}/{visualization['id']}/edit"
+    }
+
+def _store_visualizations(ws: WorkspaceRef, generated: dict, stored: dict) -> dict:
+    """
+    Store the visualizations generated for one prompt and return the result of the first one,
+    with the results of all of them under "visualizations" if the AI created several.
+    `stored` maps the IDs already stored by this call to their results, so identical visualizations are sent once.
+    """
+    results = []
+    for visualization in generated["visualizations"]:
+        if visualization["id"] not in stored:
+            created = create_visualization_object(get_gd(ws.profile).client.entities_api, ws.workspace_id, visualization)
+            stored[visualization["id"]] = _visualization_result(ws, visualization, created)
+        results.append(stored[visualization["id"]])
+    result = dict(results[0])
+    if len(results) > 1:
+        result["visualizations"] = results
+    return result
+
 @mcp.tool(
     name="create_visualization",
-    description="Creates a visualization using a prompt and adds it directly to the GoodData workspace. Returns a confirmation and the new visualization's ID."
+    description="Creates a visualization using a prompt and adds it directly to the GoodData workspace. Returns a confirmation and the new visualization's ID; a visualization identical to an existing one is not created again. workspace_id and profile select another workspace or GoodData host than the configured default."
 )
-def create_visualization(prompt: str) -> dict:
+@tool_runner.offload(writes=True)
+def create_visualization(prompt: str, ctx: Context = None, workspace_id: str | None = None, profile: str | None = None) -> dict:
     """
     Calls the GoodData AI compute engine to create a visualization and adds it to the workspace.
     Returns a confirmation message and the new visualization's ID.
     """
     try:
-        result = gd.compute.ai_chat_stream(workspace_id=GD_WORKSPACE, question=prompt)
-        visualization = [chunk for chunk in result if "createdVisualizations" in chunk]
-        if len(visualization) == 0:
-            return {"error": "No visualization object found in AI chat output."}
-        visualization = visualization[0].get("createdVisualizations", {})
-        visualization_converted = convert(visualization)
-        if len(visualization_converted) == 0:
-            return {"error": "Conversion failed."}
-        declarative_workspace = gd.catalog_workspace.get_declarative_workspace(workspace_id=GD_WORKSPACE)
-        if hasattr(declarative_workspace.analytics, "visualization_objects"):
-            declarative_workspace.analytics.visualization_objects.append(visualization_converted)
-        else:
-            declarative_workspace.analytics.visualization_objects = [visualization_converted]
-        gd.catalog_workspace.put_declarative_workspace(workspace_id=GD_WORKSPACE, workspace=declarative_workspace)
-        
-        return {
-            "message": f"Visualization '{visualization_converted.get('title')}' added to workspace.",
-            "id": visualization_converted.get("id"),
-            "url": f"{GD_HOST}/analyze/#/{GD_WORKSPACE}/{visualization_converted['id']}/edit"
-        }
+        ws = client_pool.resolve(workspace_id, profile)
+        generated = _generate_visualization(ws, prompt, _progress_reporter(ctx))
+        if "error" in generated:
+            return generated
+        try:
+            return _store_visualizations(ws, generated, {})
+        finally:
+            invalidate_analytics(ws)
+    except Exception as e:
+        return {"error": str(e)}
+
+@mcp.tool(
+    name="create_visualizations",
+    description="Creates several visualizations from several prompts at once. The prompts are sent to GoodData AI concurrently and the visualizations are stored only after all of them were generated. Returns a result for every prompt. workspace_id and profile select another workspace or GoodData host than the configured default."
+)
+@tool_runner.offload(writes=True)
+def create_visualizations(prompts: list[str], ctx: Context = None, workspace_id: str | None = None, profile: str | None = None) -> dict:
+    """
+    Generate visualizations for all prompts concurrently, then store the generated ones.
+    Returns the result of every prompt in input order.
+    """
+    try:
+        ws = client_pool.resolve(workspace_id, profile)
+        # Progress counts the chunks received over all streams
+        report = _progress_reporter(ctx)
+        with ThreadPoolExecutor(max_workers=max(1, min(len(prompts), VISUALIZATION_PARALLELISM))) as executor:
+            futures = [
+                executor.submit(contextvars.copy_context().run, _generate_visualization, ws, prompt, report)
+                for prompt in prompts
+            ]
+            generated = []
+            for future in futures:
+                try:
+                    generated.append(future.result())
+                except Exception as e:
+                    generated.append({"error": str(e)})
+        results = []
+        stored = {}
+        try:
+            for prompt, visualizations in zip(prompts, generated):
+                if "error" in visualizations:
+                    results.append({"prompt": prompt, **visualizations})
+                    continue
+                try:
+                    results.append({"prompt": prompt, **_store_visualizations(ws, visualizations, stored)})
+                except Exception as e:
+                    results.append({"prompt": prompt, "error": str(e)})
+        finally:
+            invalidate_analytics(ws)
+        return {"results": results}
     except Exception as e:
         return {"error": str(e)}
 
 @mcp.tool(
     name="add_visualization_to_dashboard",
-    description="Add a visualization to a dashboard. Requires the visualization_id and dashboard_id as inputs."
+    description="Add a visualization to a dashboard. Requires the visualization_id and dashboard_id as inputs. workspace_id and profile select another workspace or GoodData host than the configured default."
 )
-def add_visualization_to_dashboard(visualization_id: str, dashboard_id: str) -> str:
+@tool_runner.offload(writes=True, error_format=to_yaml)
+def add_visualization_to_dashboard(visualization_id: str, dashboard_id: str, workspace_id: str | None = None, profile: str | None = None) -> str:
     """
     You must provide the visualization_id of an existing visualization (ask for it if not provided). This tool will then place it on the first dashboard. It does not generate or search for the visualization_id itself. Returns a YAML message confirming the visual has been placed in the dashboard.
     """
     try:
-        declarative_workspace = gd.catalog_workspace.get_declarative_workspace(workspace_id=GD_WORKSPACE)
-        dashboards = getattr(declarative_workspace.analytics, "analytical_dashboards", [])
-        if not dashboards:
-            return yaml.safe_dump({"error": "No dashboards found in workspace."}, sort_keys=False, allow_unicode=True)
-        dashboard = next((d for d in dashboards if d.id == dashboard_id), None)
-        if not dashboard:
-            return yaml.safe_dump({"error": f"Dashboard {dashboard_id} not found in workspace."}, sort_keys=False, allow_unicode=True)
-        layout = dashboard.content.get("layout", {})
+        ws = client_pool.resolve(workspace_id, profile)
+        content = get_dashboard_content(get_gd(ws.profile).client.entities_api, ws.workspace_id, dashboard_id)
+        if content is None:
+            return to_yaml({"error": f"Dashboard {dashboard_id} not found in workspace."})
+        layout = content.get("layout", {})
         sections = layout.get("sections", [])
 
         # Use the first item in the first section as a template
@@ -301,16 +741,82 @@ def add_visualization_to_dashboard(visualization_id: str, dashboard_id: str) ->
                 "type": "IDashboardLayoutSection"
             })
         layout["sections"] = sections
-        dashboard.content["layout"] = layout
-        gd.catalog_workspace.put_declarative_workspace(workspace_id=GD_WORKSPACE, workspace=declarative_workspace)
+        content["layout"] = layout
+        try:
+            # Only the layout of this dashboard is sent, other objects of the workspace are not touched
+            update_dashboard_content(get_gd(ws.profile).client.entities_api, ws.workspace_id, dashboard_id, content)
+        finally:
+            invalidate_analytics(ws)
         result = {
             "message": f"Visualization {visualization_id} has been placed in the dashboard.",
             "visualization_id": visualization_id,
-            "url": f"{GD_HOST}/dashboards/#/workspace/{GD_WORKSPACE}/dashboard/{dashboard_id}"
+            "url": f"{ws.host}/dashboards/#/workspace/{ws.workspace_id}/dashboard/{dashboard_id}"
         }
-        return yaml.safe_dump(result, sort_keys=False, allow_unicode=True)
+        return to_yaml(result)
     except Exception as e:
-        return yaml.safe_dump({"error": str(e)}, sort_keys=False, allow_unicode=True)
+        return to_yaml({"error": str(e)})
+
+@mcp.tool(
+    name="metadata_cache_stats",
+    description="Show hit/miss statistics of the in-process metadata cache. Set clear=True to drop all cached documents, e.g. after the workspace was edited outside of this server; "
+                "with workspace_id and/or profile only the documents of that workspace are dropped."
+)
+def metadata_cache_stats(clear: bool = False, workspace_id: str | None = None, profile: str | None = None) -> dict:
+    """Return metadata cache statistics and optionally clear the cache."""
+    if clear:
+        if workspace_id or profile:
+            try:
+                ws = client_pool.resolve(workspace_id, profile)
+            except ValueError as e:
+                return {"error": str(e)}
+            metadata_cache.invalidate(ws.key)
+            search_cache.invalidate(ws.key)
+        else:
+            metadata_cache.invalidate()
+            search_cache.invalidate()
+    return metadata_cache.stats()
+
+@mcp.tool(
+    name="performance_metrics",
+    description="Show latency histograms, error and timeout counts and response sizes of tool calls and GoodData API calls, cache hit rates and stacks of slow calls. format is 'json' or 'prometheus'; set reset=True to start counting anew."
+)
+def performance_metrics(format: str = "json", reset: bool = False) -> dict | str:
+    """Return the collected performance metrics and optionally reset them."""
+    if format not in ("json", "prometheus"):
+        return {"error": f"Unsupported format {format}, expected 'json' or 'prometheus'."}
+    result = metrics.to_prometheus() if format == "prometheus" else metrics.snapshot()
+    if reset:
+        metrics.reset()
+    return result
+
+@mcp.resource(
+    "metrics://prometheus",
+    name="prometheus_metrics",
+    description="Performance metrics of the server in the Prometheus text exposition format.",
+    mime_type="text/plain",
+)
+def prometheus_metrics() -> str:
+    return metrics.to_prometheus()
+
+def warm_up() -> None:
+    """Import the modules the tools need and prefetch the workspace metadata, so that the first tool call is fast."""
+    try:
+        import yaml  # noqa: F401
+        import ldm_quality_check  # noqa: F401
+        if not client_pool.profile(None).workspace_id:
+            return
+        ws = client_pool.resolve()
+        get_ldm_index(ws)
+        get_metrics_by_id(ws)
+        get_dependency_index(ws)
+        get_search_index(ws)
+    except Exception:
+        # A failed warm-up only means the first tool call loads the metadata itself
+        logging.getLogger(__name__).exception("Warm-up of the workspace metadata failed")
+
+# With GOODDATA_WARMUP=1 the metadata is fetched in the background while the client connects
+if os.environ.get("GOODDATA_WARMUP", "0") == "1":
+    threading.Thread(target=warm_up, name="gooddata-warmup", daemon=True).start()
 
 # Reset logging settings that MCP made because we want to use our own logging configuration configured in the bootstrap script
 logging.basicConfig(force=True, handlers=[], level=logging.NOTSET)
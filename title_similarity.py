@@ -0,0 +1,235 @@
+from collections import Counter
+from difflib import SequenceMatcher
+from functools import partial
+import math
+import re
+
+# Guards the filter bounds against float rounding; it only makes them more permissive
+_EPSILON = 1e-9
+
+_SEPARATORS = re.compile(r"[\s_\-.]+")
+
+# Trigrams are unreliable for titles shorter than this, their pairs are found exactly by default
+SHORT_TITLE_LENGTH = 12
+
+
+def _trigrams(text: str) -> frozenset[tuple[str, int]]:
+    """
+    Turn a string into a set of (trigram, occurrence) tokens.
+
+    Separators are unified so that "Order Date" and "order_date" share their trigrams, the string
+    is padded so that the first and last characters form trigrams too, and repeated trigrams are
+    numbered so that set overlap equals multiset overlap.
+    """
+    padded = "  " + _SEPARATORS.sub(" ", text) + "  "
+    seen = Counter()
+    tokens = []
+    for i in range(len(padded) - 2):
+        trigram = padded[i:i + 3]
+        seen[trigram] += 1
+        tokens.append((trigram, seen[trigram]))
+    return frozenset(tokens)
+
+
+def _bigrams(text: str) -> frozenset[tuple[str, int]]:
+    """
+    Turn a string into a set of (bigram, occurrence) tokens.
+
+    Unlike trigrams, the text is kept as it is, so that the bound of _shared_bigrams holds, and
+    padded with a character titles do not contain, so that a string of n characters has n + 1 bigrams.
+    """
+    padded = "\0" + text + "\0"
+    seen = Counter()
+    tokens = []
+    for i in range(len(padded) - 1):
+        bigram = padded[i:i + 2]
+        seen[bigram] += 1
+        tokens.append((bigram, seen[bigram]))
+    return frozenset(tokens)
+
+
+def _characters(text: str) -> frozenset[tuple[str, int]]:
+    """Turn a string into a set of (character, occurrence) tokens, so that set overlap equals multiset overlap."""
+    seen = Counter()
+    tokens = []
+    for character in text:
+        seen[character] += 1
+        tokens.append((character, seen[character]))
+    return frozenset(tokens)
+
+
+def _dice_overlap(size: int, other_size: int, threshold: float) -> float:
+    """Shared tokens two sets of `size` and `other_size` tokens need to reach the Dice threshold."""
+    return math.ceil(threshold * (size + other_size) / 2 - _EPSILON)
+
+
+def _shared_bigrams(size: int, other_size: int, threshold: float) -> float:
+    """
+    Fewest bigrams two strings with `size` and `other_size` bigrams share when their ratio is above the threshold.
+
+    The matching blocks of SequenceMatcher form a common subsequence of more than
+    threshold * (a + b) / 2 characters of strings of a and b characters. A bigram of the first
+    string survives unless one of its characters is outside the subsequence (each such character
+    breaks two bigrams) or characters of the second string were inserted between its characters
+    (each such gap breaks one), so at least 3 * common - a - b + 1 bigrams are shared.
+    """
+    length, other_length = size - 1, other_size - 1
+    common = math.floor(threshold * (length + other_length) / 2 - _EPSILON) + 1
+    if common > min(length, other_length):
+        return math.inf
+    return 3 * common - length - other_length + 1
+
+
+def _ratio_above(first: str, second: str, threshold: float) -> bool:
+    matcher = SequenceMatcher(None, first, second)
+    return matcher.real_quick_ratio() > threshold and matcher.quick_ratio() > threshold and matcher.ratio() > threshold
+
+
+def _partner_length(length: int, threshold: float) -> float:
+    """Longest title that can have a ratio above the threshold with a title of `length` characters."""
+    return math.inf if threshold <= 0 else length * (2 - threshold) / threshold
+
+
+def _candidates(tokens: list[frozenset], window: float, required):
+    """
+    Yield index pairs (n, m) of token sets that share at least required(size_n, size_m) tokens,
+    using prefix filtering over an inverted index so that most pairs are never looked at.
+
+    Args:
+        tokens: Token sets
+        window: Partners of a set of `size` tokens have at least size * window and at most size / window tokens
+        required: Shared tokens a pair of sets needs, given their sizes
+    """
+    frequency = Counter(token for token_set in tokens for token in token_set)
+    # Process smaller sets first so every probe only needs to look at already indexed, smaller sets
+    order = sorted(range(len(tokens)), key=lambda n: len(tokens[n]))
+    # Shared tokens any partner needs with a set of the size, bounds the prefix of the set
+    min_overlaps: dict[int, float] = {}
+    # Shared tokens a pair of sizes needs; sizes repeat a lot, so it is computed once per pair of sizes
+    overlaps: dict[tuple[int, int], float] = {}
+
+    index: dict[tuple[str, int], list[int]] = {}
+    # Postings are ordered by size and the minimal partner size only grows, so too small
+    # partners can be skipped for good by moving the start of each posting list
+    starts: dict[tuple[str, int], int] = {}
+    for n in order:
+        token_set = tokens[n]
+        size = len(token_set)
+        if size not in min_overlaps:
+            largest = math.floor(size / window + _EPSILON) if window > 0 else size
+            min_overlaps[size] = min(
+                required(size, other_size) for other_size in range(math.ceil(size * window - _EPSILON), largest + 1)
+            )
+        if min_overlaps[size] == math.inf:
+            continue
+        # Any pair sharing the minimal overlap shares a token of both prefixes
+        prefix = sorted(token_set, key=lambda token: (frequency[token], token))
+        prefix = prefix[:max(0, size - min_overlaps[size]) + 1]
+        min_size = size * window - _EPSILON
+        candidates = set()
+        for token in prefix:
+            postings = index.setdefault(token, [])
+            start = starts.get(token, 0)
+            while start < len(postings) and len(tokens[postings[start]]) < min_size:
+                start += 1
+            starts[token] = start
+            candidates.update(postings[start:])
+            postings.append(n)
+        for m in candidates:
+            other = tokens[m]
+            sizes = (size, len(other))
+            if sizes not in overlaps:
+                overlaps[sizes] = required(*sizes)
+            if len(token_set & other) >= overlaps[sizes]:
+                yield n, m
+
+
+def _lossless_filter(threshold: float):
+    """Tokenizer, size window and required overlap of a candidate filter that misses no pair above the threshold."""
+    if threshold >= 2 / 3:
+        # The bound of _shared_bigrams is positive, so every pair above the threshold shares a bigram
+        return _bigrams, threshold / (2 - threshold), partial(_shared_bigrams, threshold=threshold)
+    # The character Dice coefficient is SequenceMatcher.quick_ratio, an upper bound of the ratio
+    return _characters, max(threshold, 0) / (2 - threshold), partial(_dice_overlap, threshold=threshold)
+
+
+def find_similar_titles(titles: list[str], threshold: float = 0.8, candidate_threshold: float | None = None,
+                        exact: bool = False, short_length: int = SHORT_TITLE_LENGTH) -> list[tuple[int, int]]:
+    """
+    Find pairs of titles whose SequenceMatcher ratio (case-insensitive) is above the threshold.
+
+    Instead of running SequenceMatcher on every pair, candidate pairs are generated first:
+    titles are split into tokens and only pairs sharing enough tokens are compared, using prefix
+    filtering over an inverted index so that most pairs are never looked at. Candidates are then
+    confirmed with the same ratio check as check_semantic_similarity, so every reported pair
+    satisfies the original threshold. Two filters produce the candidates:
+
+    - The lossless filter requires the number of shared bigrams every pair above the threshold
+      has (shared characters below a threshold of 2/3), so no pair is missed.
+    - The trigram filter requires a trigram Dice coefficient of `candidate_threshold` (default
+      threshold - 0.4). This is a heuristic, not a bound: titles that differ in a few characters
+      share few trigrams when they are short (e.g. "code sku" and "order sku").
+
+    By default the lossless filter covers the titles shorter than `short_length` characters and
+    the titles they can be similar to, and the trigram filter all titles, so only pairs of two
+    long titles may be missed. On the benchmark titles (benchmarks/bench_similarity.py) this
+    takes about 15% longer than the trigram filter alone: 3.5s for 10k and 12s for 20k titles.
+    With exact=True the lossless filter covers all titles. Long titles share many bigrams with
+    each other, so its cost grows near-quadratically: 10s for 10k and 40s for 20k titles.
+
+    Args:
+        titles: Titles to compare; empty titles never match
+        threshold: Similarity threshold (0.0 to 1.0)
+        candidate_threshold: Minimum trigram Dice coefficient of a candidate pair, ignored with exact=True
+        exact: Find exactly the pairs the pairwise check finds
+        short_length: Pairs with a title shorter than this are always found
+
+    Returns:
+        list[tuple[int, int]]: Index pairs (i, j) with i < j, sorted
+    """
+    if candidate_threshold is None:
+        candidate_threshold = threshold - 0.4
+    texts = [title.lower() if title else "" for title in titles]
+
+    # Identical titles always match each other, so only distinct titles go through the index
+    positions: dict[str, list[int]] = {}
+    for i, text in enumerate(texts):
+        if text:
+            positions.setdefault(text, []).append(i)
+    pairs = []
+    if threshold < 1:
+        for same in positions.values():
+            pairs.extend((i, j) for n, i in enumerate(same) for j in same[n + 1:])
+
+    distinct = list(positions)
+    everything = list(range(len(distinct)))
+    if exact:
+        filters = [(everything, *_lossless_filter(threshold))]
+    else:
+        # Every title a short title can be similar to is at most this long
+        longest_partner = _partner_length(short_length - 1, threshold)
+        short = [n for n, text in enumerate(distinct) if len(text) <= longest_partner]
+        window = max(candidate_threshold, 0) / (2 - candidate_threshold)
+        filters = [
+            (short, *_lossless_filter(threshold)),
+            (everything, _trigrams, window, partial(_dice_overlap, threshold=candidate_threshold)),
+        ]
+    compared = set()
+    for members, tokenize, window, required in filters:
+        for first, second in _candidates([tokenize(distinct[n]) for n in members], window, required):
+            n, m = members[first], members[second]
+            if (min(n, m), max(n, m)) in compared:
+                continue
+            compared.add((min(n, m), max(n, m)))
+            # SequenceMatcher is not symmetric, compare in input order like the pairwise check does
+            a, b = distinct[n], distinct[m]
+            matches = {}
+            for i in positions[a]:
+                for j in positions[b]:
+                    first_text, second_text = (a, b) if i < j else (b, a)
+                    if (first_text, second_text) not in matches:
+                        matches[(first_text, second_text)] = _ratio_above(first_text, second_text, threshold)
+                    if matches[(first_text, second_text)]:
+                        pairs.append((min(i, j), max(i, j)))
+    pairs.sort()
+    return pairs
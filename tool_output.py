@@ -0,0 +1,131 @@
+import json
+import uuid
+from typing import Any
+
+from metadata_cache import MetadataCache
+
+OUTPUT_FORMATS = ("yaml", "json")
+
+_yaml_dumper = None
+
+
+def to_yaml(data: Any) -> str:
+    """
+    Serialize a tool result as YAML.
+
+    Uses the libyaml based dumper when PyYAML was built with it, which is many times faster than
+    the pure Python one on large results. PyYAML is imported on first use.
+    """
+    global _yaml_dumper
+    import yaml
+    if _yaml_dumper is None:
+        _yaml_dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+    return yaml.dump(data, Dumper=_yaml_dumper, sort_keys=False, allow_unicode=True)
+
+
+def to_json(data: Any) -> str:
+    """Serialize a tool result as compact JSON, the cheapest format to produce and the shortest in the LLM context."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def serialize(data: Any, format: str) -> str:
+    """
+    Serialize a tool result in one of OUTPUT_FORMATS.
+
+    Args:
+        data: Tool result
+        format: "yaml" or "json"
+
+    Returns:
+        str: Serialized result
+    """
+    if format == "json":
+        return to_json(data)
+    if format == "yaml":
+        return to_yaml(data)
+    raise ValueError(f"Unsupported format {format}, expected one of {', '.join(OUTPUT_FORMATS)}")
+
+
+class ResultPages:
+    """
+    Keeps complete tool results server-side so that long lists in them can be returned page by page.
+
+    The first call of a tool computes the whole result; when a list does not fit into one page the
+    result is stored under a cursor id and the following pages are served from it without
+    recomputing anything. A cursor is "<result id>.<offset>".
+
+    Args:
+        cache: Where the complete results are kept; its TTL controls how long a cursor stays valid
+        page_size: Default number of items of every paged list in one page
+        max_page_size: Upper limit of the `limit` a tool call may ask for
+    """
+
+    def __init__(self, cache: MetadataCache, page_size: int = 50, max_page_size: int = 500):
+        self.cache = cache
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+
+    def _limit(self, limit: int | None) -> int:
+        """Items per page of a call: page_size if not given, at most max_page_size."""
+        if limit is None:
+            return min(self.page_size, self.max_page_size)
+        if limit < 1:
+            raise ValueError(f"limit must be at least 1, got {limit}")
+        # The model may ask for any page size, the configured maximum keeps results bounded
+        return min(limit, self.max_page_size)
+
+    def _page(self, result_id: str, result: dict, paged_keys: tuple[str, ...], offset: int, limit: int) -> dict:
+        page = dict(result)
+        totals = {}
+        has_more = False
+        for key in paged_keys:
+            items = result.get(key) or []
+            page[key] = items[offset:offset + limit]
+            totals[key] = len(items)
+            has_more = has_more or len(items) > offset + limit
+        page["page"] = {
+            "offset": offset,
+            "limit": limit,
+            "totals": totals,
+            "next_cursor": f"{result_id}.{offset + limit}" if has_more else None,
+        }
+        return page
+
+    def first(self, tool: str, result: dict, paged_keys: tuple[str, ...], limit: int | None = None) -> dict:
+        """
+        Return the first page of a freshly computed result, storing the result if more pages follow.
+
+        Args:
+            tool: Tool name; cursors are only valid for the tool that issued them
+            result: Complete result
+            paged_keys: Keys of the lists in `result` that are paged
+            limit: Items per page, defaults to page_size and is capped at max_page_size
+
+        Returns:
+            dict: `result` with the paged lists cut to one page and a "page" entry with the totals and next_cursor
+        """
+        limit = self._limit(limit)
+        result_id = uuid.uuid4().hex[:16]
+        page = self._page(result_id, result, paged_keys, 0, limit)
+        if page["page"]["next_cursor"] is not None:
+            self.cache.put(("result_pages", tool, result_id), (result, paged_keys))
+        return page
+
+    def next(self, tool: str, cursor: str, limit: int | None = None) -> dict:
+        """
+        Return the page of a stored result a cursor points to.
+
+        Args:
+            tool: Tool name
+            cursor: next_cursor of a previous page
+            limit: Items per page, defaults to page_size and is capped at max_page_size
+
+        Returns:
+            dict: The page, or {"error": ...} if the cursor is malformed or expired
+        """
+        result_id, _, offset = cursor.partition(".")
+        stored = self.cache.peek(("result_pages", tool, result_id)) if offset.isdigit() else None
+        if stored is None:
+            return {"error": f"Cursor {cursor} is unknown or expired, call {tool} again without a cursor."}
+        result, paged_keys = stored
+        return self._page(result_id, result, paged_keys, int(offset), self._limit(limit))
@@ -0,0 +1,169 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Coroutine
+
+from instrumentation import Metrics, is_error_result
+
+# Event loop of the tool call a worker thread is serving, so blocking code can notify the client
+_event_loop: contextvars.ContextVar[asyncio.AbstractEventLoop | None] = contextvars.ContextVar("event_loop", default=None)
+
+
+def run_coroutine(coroutine: Coroutine) -> None:
+    """
+    Schedule a coroutine (e.g. ctx.report_progress(...)) on the event loop of the current tool call
+    from the worker thread executing it. Does nothing outside of a tool call.
+    """
+    loop = _event_loop.get()
+    if loop is None or loop.is_closed():
+        coroutine.close()
+        return
+    asyncio.run_coroutine_threadsafe(coroutine, loop)
+
+
+class ToolRunner:
+    """
+    Runs blocking tool implementations in a shared, bounded thread pool.
+
+    Each tool has its own concurrency limit and timeout, so one slow tool (e.g. an AI chat
+    stream) cannot take all workers and stall the others.
+
+    Args:
+        max_workers: Size of the shared thread pool
+        concurrency: Default number of concurrent calls of one tool
+        timeout: Default timeout of one tool call in seconds; 0 disables the timeout
+        concurrency_overrides: Tool name -> concurrency limit
+        timeout_overrides: Tool name -> timeout in seconds
+        metrics: Records latency, errors and timeouts of every tool call
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        concurrency: int = 4,
+        timeout: float = 120.0,
+        concurrency_overrides: dict[str, int] | None = None,
+        timeout_overrides: dict[str, float] | None = None,
+        metrics: Metrics | None = None,
+    ):
+        self.max_workers = max_workers
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.concurrency_overrides = concurrency_overrides or {}
+        self.timeout_overrides = timeout_overrides or {}
+        self.metrics = metrics
+        self._executor: ThreadPoolExecutor | None = None
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        # Registered by offload: tools that change the workspace and how a tool returns its errors
+        self._writing_tools: set[str] = set()
+        self._error_formats: dict[str, Callable[[dict], object]] = {}
+
+    @classmethod
+    def from_env(cls, environ, metrics: Metrics | None = None) -> "ToolRunner":
+        """
+        Configure the runner from environment variables.
+
+        GOODDATA_MAX_WORKERS, GOODDATA_TOOL_CONCURRENCY and GOODDATA_TOOL_TIMEOUT set the defaults,
+        GOODDATA_TOOL_CONCURRENCY_<TOOL> and GOODDATA_TOOL_TIMEOUT_<TOOL> (e.g.
+        GOODDATA_TOOL_TIMEOUT_CREATE_VISUALIZATION=300) override them for a single tool.
+        """
+        concurrency_prefix = "GOODDATA_TOOL_CONCURRENCY_"
+        timeout_prefix = "GOODDATA_TOOL_TIMEOUT_"
+        return cls(
+            max_workers=int(environ.get("GOODDATA_MAX_WORKERS", "8")),
+            concurrency=int(environ.get("GOODDATA_TOOL_CONCURRENCY", "4")),
+            timeout=float(environ.get("GOODDATA_TOOL_TIMEOUT", "120")),
+            concurrency_overrides={
+                name[len(concurrency_prefix):].lower(): int(value)
+                for name, value in environ.items() if name.startswith(concurrency_prefix)
+            },
+            timeout_overrides={
+                name[len(timeout_prefix):].lower(): float(value)
+                for name, value in environ.items() if name.startswith(timeout_prefix)
+            },
+            metrics=metrics,
+        )
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="gooddata-tool")
+        return self._executor
+
+    def _semaphore(self, tool_name: str) -> asyncio.Semaphore:
+        if tool_name not in self._semaphores:
+            self._semaphores[tool_name] = asyncio.Semaphore(self.concurrency_overrides.get(tool_name, self.concurrency))
+        return self._semaphores[tool_name]
+
+    def _timeout_error(self, tool_name: str, timeout: float):
+        """Error result of a timed out call in the output format of the tool."""
+        message = f"Tool {tool_name} timed out after {timeout:g} seconds, but the call is still running."
+        if tool_name in self._writing_tools:
+            # The write cannot be cancelled, retrying blindly could apply it twice
+            message += " Its changes may still be applied; check the workspace before calling it again."
+        error = {"error": message}
+        error_format = self._error_formats.get(tool_name)
+        return error_format(error) if error_format else error
+
+    def _call(self, tool_name: str, fn: Callable, *args, **kwargs):
+        if self.metrics is None:
+            return fn(*args, **kwargs)
+        with self.metrics.track("tool", tool_name, profile=True) as record:
+            result = fn(*args, **kwargs)
+            record.error = is_error_result(result)
+            return result
+
+    async def run(self, tool_name: str, fn: Callable, *args, **kwargs):
+        """
+        Run a blocking function in the thread pool under the limits of the given tool.
+
+        Args:
+            tool_name: Name of the tool whose limits apply
+            fn: Blocking function
+            *args: Positional arguments of fn
+            **kwargs: Keyword arguments of fn
+
+        Returns:
+            The result of fn, or {"error": ...} in the error format of the tool if the call timed out
+        """
+        semaphore = self._semaphore(tool_name)
+        await semaphore.acquire()
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        context.run(_event_loop.set, loop)
+        future = loop.run_in_executor(self.executor, functools.partial(context.run, self._call, tool_name, fn, *args, **kwargs))
+        # A timed out call cannot be interrupted, so its slot is only released once it really finishes
+        future.add_done_callback(lambda _: semaphore.release())
+        timeout = self.timeout_overrides.get(tool_name, self.timeout)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=timeout or None)
+        except asyncio.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout("tool", tool_name)
+            return self._timeout_error(tool_name, timeout)
+
+    def offload(self, tool_name: str | None = None, writes: bool = False, error_format: Callable[[dict], object] | None = None) -> Callable:
+        """
+        Turn a blocking tool function into an async one running in the thread pool.
+
+        The wrapper keeps the signature of the wrapped function, so MCP still derives
+        the tool arguments from it.
+
+        Args:
+            tool_name: Name of the tool whose limits apply; defaults to the function name
+            writes: The tool changes the workspace, a timeout warns that the change may still be applied
+            error_format: Turns an {"error": ...} dict into the output of the tool (e.g. to_yaml); dict if not given
+        """
+        def decorator(fn: Callable) -> Callable:
+            name = tool_name or fn.__name__
+            if writes:
+                self._writing_tools.add(name)
+            if error_format is not None:
+                self._error_formats[name] = error_format
+
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                return await self.run(name, fn, *args, **kwargs)
+            return wrapper
+        return decorator
@@ -1,36 +1,158 @@
-import random
+import hashlib
+
+# visualizationType of GoodData AI -> (visualizationUrl, buckets of the metrics, buckets of the attributes).
+# Metrics and attributes fill their buckets in order; every name takes one item, a name ending with "*"
+# takes all remaining items. Items beyond the layout of a type are left out.
+# Bar, column and area charts allow a second view attribute only while the stack bucket is empty,
+# so they take one view and one stack attribute.
+BUCKET_LAYOUTS = {
+    "TABLE": ("local:table", ("measures*",), ("attribute*",)),
+    "HEADLINE": ("local:headline", ("measures", "secondary_measures", "secondary_measures"), ()),
+    "BAR": ("local:bar", ("measures*",), ("view", "stack")),
+    "COLUMN": ("local:column", ("measures*",), ("view", "stack")),
+    "LINE": ("local:line", ("measures*",), ("trend", "segment")),
+    "AREA": ("local:area", ("measures*",), ("view", "stack")),
+    "PIE": ("local:pie", ("measures*",), ("view",)),
+    "DONUT": ("local:donut", ("measures*",), ("view",)),
+    "TREEMAP": ("local:treemap", ("measures*",), ("view", "segment")),
+    "HEATMAP": ("local:heatmap", ("measures",), ("view", "stack")),
+    "SCATTER": ("local:scatter", ("measures", "secondary_measures"), ("attribute",)),
+    "BUBBLE": ("local:bubble", ("measures", "secondary_measures", "tertiary_measures"), ("view",)),
+}
+# Types without a known layout keep the bucket layout of a column chart
+DEFAULT_LAYOUT = (("measures*",), ("view", "stack"))
+# Stack and segment buckets accept an attribute only while there is a single measure, with more
+# measures the attributes go to these buckets instead: bar, column and area charts take a second
+# view attribute, line charts and treemaps leave the second attribute out.
+MULTI_MEASURE_ATTRIBUTE_LAYOUTS = {
+    "BAR": ("view", "view"),
+    "COLUMN": ("view", "view"),
+    "LINE": ("trend",),
+    "AREA": ("view", "view"),
+    "TREEMAP": ("view",),
+}
+DEFAULT_MULTI_MEASURE_ATTRIBUTE_LAYOUT = ("view", "view")
+# Pie and donut charts show several measures only without a view attribute, with one they show the first measure
+SINGLE_MEASURE_WITH_VIEW = {"PIE", "DONUT"}
+
+
+def _digest(text: str, size: int) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=size).hexdigest()
+
+
+def _fill(items: list, layout: tuple[str, ...]) -> list[tuple[str, dict]]:
+    """Assign items to bucket names following the layout, see BUCKET_LAYOUTS."""
+    assigned = []
+    slots = iter(layout)
+    slot = None
+    for item in items:
+        if slot is None or not slot.endswith("*"):
+            slot = next(slots, None)
+            if slot is None:
+                break
+        assigned.append((slot.rstrip("*"), item))
+    return assigned
+
+
+def _measure_definition(metric: dict) -> dict:
+    item_type = metric.get("type", "metric")
+    if item_type == "metric":
+        return {"measureDefinition": {"filters": [], "item": {"identifier": {"id": metric["id"], "type": "metric"}}}}
+    if item_type == "fact":
+        return {"measureDefinition": {
+            "aggregation": (metric.get("aggFunction") or "SUM").lower(),
+            "filters": [],
+            "item": {"identifier": {"id": metric["id"], "type": "fact"}},
+        }}
+    # Counting attribute values, e.g. "number of customers"
+    return {"measureDefinition": {
+        "aggregation": (metric.get("aggFunction") or "COUNT").lower(),
+        "filters": [],
+        "item": {"identifier": {"id": metric["id"], "type": "label" if item_type == "label" else "attribute"}},
+    }}
+
+
+def _buckets(metrics: list[dict], attributes: list[dict], metric_layout: tuple[str, ...], attribute_layout: tuple[str, ...], keys: list[str]) -> list[dict]:
+    """
+    Buckets of the visualization content. Local identifiers are hashes of the key of the item:
+    its bucket, position and everything that goes into its definition. The keys are appended to `keys`.
+    """
+    buckets: dict[str, list] = {}
+    for position, (bucket, metric) in enumerate(_fill(metrics, metric_layout)):
+        definition = _measure_definition(metric)
+        key = f"m|{bucket}|{position}|{metric.get('type', 'metric')}|{metric.get('aggFunction')}|{metric['id']}"
+        keys.append(f"{key}|{metric['title']}")
+        buckets.setdefault(bucket, []).append(
+            {"measure": {"localIdentifier": _digest(key, 8), "definition": definition, "title": metric["title"]}}
+        )
+    for position, (bucket, attribute) in enumerate(_fill(attributes, attribute_layout)):
+        key = f"a|{bucket}|{position}|{attribute['id']}"
+        keys.append(key)
+        buckets.setdefault(bucket, []).append(
+            {"attribute": {"localIdentifier": _digest(key, 8), "displayForm": {"identifier": {"id": attribute["id"], "type": "label"}}}}
+        )
+    return [{"items": items, "localIdentifier": bucket} for bucket, items in buckets.items()]
+
+
+def convert_object(visualization: dict) -> dict:
+    """
+    Convert one visualization created by GoodData AI into a visualization object.
+
+    The ID is the AI-proposed ID followed by a hash of the converted object, so converting the same
+    visualization again gives the same ID and storing it again can be skipped.
+
+    Args:
+        visualization: Item of createdVisualizations.objects of the AI chat
+
+    Returns:
+        dict: Visualization with id, title and content
+    """
+    visualization_type = visualization["visualizationType"].upper()
+    url, metric_layout, attribute_layout = BUCKET_LAYOUTS.get(
+        visualization_type, (f"local:{visualization_type.lower()}", *DEFAULT_LAYOUT)
+    )
+    metrics = visualization.get("metrics") or []
+    attributes = visualization.get("dimensionality") or []
+    if visualization_type in SINGLE_MEASURE_WITH_VIEW and attributes:
+        metric_layout = ("measures",)
+    if len(_fill(metrics, metric_layout)) > 1:
+        attribute_layout = MULTI_MEASURE_ATTRIBUTE_LAYOUTS.get(
+            visualization_type, attribute_layout if visualization_type in BUCKET_LAYOUTS else DEFAULT_MULTI_MEASURE_ATTRIBUTE_LAYOUT
+        )
+    title = visualization["title"]
+    # The keys of the items together with the title and type determine the whole object
+    keys = [title, url]
+    content = {
+        "visualizationUrl": url,
+        "filters": [],
+        "properties": {},
+        "buckets": _buckets(metrics, attributes, metric_layout, attribute_layout, keys),
+        "version": "2",
+    }
+    return {"content": content, "id": f"{visualization['id']}_{_digest(chr(30).join(keys), 4)}", "title": title}
+
+
+def convert_all(content: dict) -> list[dict]:
+    """
+    Convert all visualizations of a createdVisualizations AI chat response.
+
+    Identical visualizations in one response are returned once.
+
+    Args:
+        content: createdVisualizations of the AI chat
+
+    Returns:
+        list[dict]: Converted visualizations in response order
+    """
+    converted = {}
+    for visualization in content.get("objects", []):
+        result = convert_object(visualization)
+        converted.setdefault(result["id"], result)
+    return list(converted.values())
+
 
 def convert(content: dict) -> dict:
+    """Convert the first visualization of a createdVisualizations AI chat response, {} if there is none."""
     if len(content.get("objects", [])) == 0:
         return {}
-    visualization = content["objects"][0]    
-    title = visualization["title"]
-    id = visualization["id"] + "_" + str(random.randint(10000000, 99999999))
-    visualization_type = visualization["visualizationType"]
-    metrics = visualization["metrics"]
-    dimensionality = visualization["dimensionality"]
-    metrics = [{'items': [{"measure": {"localIdentifier": str(random.randint(10000000, 99999999)), "definition": {'measureDefinition': {'filters': [], 'item': {'identifier': {'id': metric["id"], 'type': 'metric'}}}}, "title": metric["title"]}} for metric in metrics], "localIdentifier": "measures"}]
-    # This will be different for different visualization types
-    view = []
-    stack = []
-        
-    if len(dimensionality) == 1:
-        view = [{'items': [{"attribute": {"localIdentifier": str(random.randint(10000000, 99999999)), "displayForm": {'identifier': {'id': dimensionality[0]["id"], 'type': 'label'}}}}], "localIdentifier": "view"}]
-    elif len(dimensionality) == 2:
-        view = [{'items': [{"attribute": {"localIdentifier": str(random.randint(10000000, 99999999)), "displayForm": {'identifier': {'id': dimensionality[0]["id"], 'type': 'label'}}}}], "localIdentifier": "view"}]
-        stack = [{'items': [{"attribute": {"localIdentifier": str(random.randint(10000000, 99999999)), "displayForm": {'identifier': {'id': dimensionality[1]["id"], 'type': 'label'}}}}], "localIdentifier": "stack"}]
-    else:
-        view = []
-        stack = []
-    
-    return {
-        "content": {
-            "visualizationUrl": f"local:{visualization_type.lower()}",
-            "filters": [],
-            "properties": {},
-            "buckets": metrics + view + stack,
-            "version": "2"
-        },
-        "id": id,
-        "title": title,
-    }
\ No newline at end of file
+    return convert_object(content["objects"][0])
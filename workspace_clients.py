@@ -0,0 +1,118 @@
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+DEFAULT_PROFILE = "default"
+
+
+@dataclass(frozen=True)
+class Profile:
+    """Connection to one GoodData host; workspace_id and data_source_id are the defaults of tool calls."""
+    name: str
+    host: str | None
+    token: str | None
+    workspace_id: str | None = None
+    data_source_id: str | None = None
+
+
+@dataclass(frozen=True)
+class WorkspaceRef:
+    """
+    Workspace a tool call works with. `key` identifies it in cache keys across hosts.
+    data_source_id is the profile's default, used only for datasets that do not name their data source.
+    """
+    profile: str
+    workspace_id: str
+    data_source_id: str | None
+    host: str | None
+
+    @property
+    def key(self) -> tuple[str, str]:
+        return (self.profile, self.workspace_id)
+
+
+def profiles_from_env(environ) -> dict[str, Profile]:
+    """
+    Read connection profiles from environment variables.
+
+    GOODDATA_HOST, GOODDATA_TOKEN, GOODDATA_WORKSPACE and GOODDATA_DATA_SOURCE form the "default"
+    profile; GOODDATA_HOST__<PROFILE>, GOODDATA_TOKEN__<PROFILE>, GOODDATA_WORKSPACE__<PROFILE> and
+    GOODDATA_DATA_SOURCE__<PROFILE> (e.g. GOODDATA_HOST__EU) define further profiles.
+    """
+    names = {name[len("GOODDATA_HOST__"):] for name in environ if name.startswith("GOODDATA_HOST__")}
+    profiles = {
+        DEFAULT_PROFILE: Profile(
+            DEFAULT_PROFILE,
+            environ.get("GOODDATA_HOST"),
+            environ.get("GOODDATA_TOKEN"),
+            environ.get("GOODDATA_WORKSPACE"),
+            environ.get("GOODDATA_DATA_SOURCE"),
+        ),
+    }
+    for name in names:
+        profiles[name.lower()] = Profile(
+            name.lower(),
+            environ.get(f"GOODDATA_HOST__{name}"),
+            environ.get(f"GOODDATA_TOKEN__{name}"),
+            environ.get(f"GOODDATA_WORKSPACE__{name}"),
+            environ.get(f"GOODDATA_DATA_SOURCE__{name}"),
+        )
+    return profiles
+
+
+class ClientPool:
+    """
+    One SDK client per profile, created on first use and shared by all tool calls.
+
+    Reusing the client reuses its HTTP connection pool, so consecutive calls to the same host
+    keep their connections alive instead of opening new ones.
+
+    Args:
+        profiles: Profile name -> Profile
+        factory: Creates the client of a profile
+    """
+
+    def __init__(self, profiles: dict[str, Profile], factory: Callable[[Profile], Any]):
+        self.profiles = profiles
+        self.factory = factory
+        self._clients: dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def profile(self, name: str | None) -> Profile:
+        name = (name or DEFAULT_PROFILE).lower()
+        if name not in self.profiles:
+            raise ValueError(f"Unknown profile {name}, configured profiles: {', '.join(sorted(self.profiles))}")
+        return self.profiles[name]
+
+    def get(self, name: str | None = None) -> Any:
+        """Return the client of a profile (the default one if no name is given)."""
+        profile = self.profile(name)
+        client = self._clients.get(profile.name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(profile.name)
+                if client is None:
+                    client = self._clients[profile.name] = self.factory(profile)
+        return client
+
+    def put(self, name: str, client: Any) -> None:
+        """Use an already created client for a profile (e.g. a stand-in backend in benchmarks)."""
+        with self._lock:
+            self._clients[self.profile(name).name] = client
+
+    def resolve(self, workspace_id: str | None = None, profile: str | None = None) -> WorkspaceRef:
+        """
+        Resolve the workspace of a tool call, falling back to the defaults of the profile.
+
+        Args:
+            workspace_id: Workspace ID given to the tool
+            profile: Profile name given to the tool
+
+        Returns:
+            WorkspaceRef: The workspace and the profile it is reached through
+        """
+        selected = self.profile(profile)
+        workspace_id = workspace_id or selected.workspace_id
+        if not workspace_id:
+            raise ValueError(f"No workspace_id given and profile {selected.name} has no default workspace")
+        return WorkspaceRef(selected.name, workspace_id, selected.data_source_id, selected.host)
@@ -0,0 +1,84 @@
+# Entity-level endpoints touch a single object, so their cost does not depend on the workspace size
+# and they do not overwrite concurrent changes of other objects the way a declarative PUT does.
+# The API client models are imported on first use, they are slow to import and not needed at startup.
+
+
+def create_visualization_object(entities_api, workspace_id: str, visualization: dict) -> bool:
+    """
+    Create a single visualization object, unless an object with its ID already exists.
+
+    Args:
+        entities_api: EntitiesApi of the GoodData API client (gd.client.entities_api)
+        workspace_id: Workspace ID
+        visualization: Visualization with id, title and content as returned by convert()
+
+    Returns:
+        bool: False if the visualization already existed; its IDs are content hashes, so it is the same visualization
+    """
+    from gooddata_api_client.exceptions import ApiException
+    from gooddata_api_client.model.json_api_visualization_object_in_attributes import JsonApiVisualizationObjectInAttributes
+    from gooddata_api_client.model.json_api_visualization_object_post_optional_id import JsonApiVisualizationObjectPostOptionalId
+    from gooddata_api_client.model.json_api_visualization_object_post_optional_id_document import JsonApiVisualizationObjectPostOptionalIdDocument
+
+    document = JsonApiVisualizationObjectPostOptionalIdDocument(
+        data=JsonApiVisualizationObjectPostOptionalId(
+            id=visualization["id"],
+            type="visualizationObject",
+            attributes=JsonApiVisualizationObjectInAttributes(
+                title=visualization["title"],
+                content=visualization["content"],
+            ),
+        )
+    )
+    try:
+        entities_api.create_entity_visualization_objects(workspace_id, document, _check_return_type=False)
+    except ApiException as e:
+        if e.status == 409:
+            return False
+        raise
+    return True
+
+
+def get_dashboard_content(entities_api, workspace_id: str, dashboard_id: str) -> dict | None:
+    """
+    Fetch the content (layout) of a single dashboard.
+
+    Args:
+        entities_api: EntitiesApi of the GoodData API client (gd.client.entities_api)
+        workspace_id: Workspace ID
+        dashboard_id: Dashboard ID
+
+    Returns:
+        dict | None: Dashboard content, or None if the dashboard does not exist
+    """
+    from gooddata_api_client.exceptions import NotFoundException
+
+    try:
+        document = entities_api.get_entity_analytical_dashboards(workspace_id, dashboard_id, _check_return_type=False)
+    except NotFoundException:
+        return None
+    return document.data.attributes.content
+
+
+def update_dashboard_content(entities_api, workspace_id: str, dashboard_id: str, content: dict) -> None:
+    """
+    Replace the content of a single dashboard, leaving its other attributes untouched.
+
+    Args:
+        entities_api: EntitiesApi of the GoodData API client (gd.client.entities_api)
+        workspace_id: Workspace ID
+        dashboard_id: Dashboard ID
+        content: New dashboard content
+    """
+    from gooddata_api_client.model.json_api_analytical_dashboard_patch import JsonApiAnalyticalDashboardPatch
+    from gooddata_api_client.model.json_api_analytical_dashboard_patch_attributes import JsonApiAnalyticalDashboardPatchAttributes
+    from gooddata_api_client.model.json_api_analytical_dashboard_patch_document import JsonApiAnalyticalDashboardPatchDocument
+
+    document = JsonApiAnalyticalDashboardPatchDocument(
+        data=JsonApiAnalyticalDashboardPatch(
+            id=dashboard_id,
+            type="analyticalDashboard",
+            attributes=JsonApiAnalyticalDashboardPatchAttributes(content=content),
+        )
+    )
+    entities_api.patch_entity_analytical_dashboards(workspace_id, dashboard_id, document, _check_return_type=False)